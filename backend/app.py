@@ -1,8 +1,11 @@
+import os
+
 from flask import Flask
 from flask_cors import CORS
 
 from database import db, migrate
 from config import Config
+from json_provider import OrjsonProvider
 
 # ✅ SINGLE SOURCE OF TRUTH FOR INVOICES
 from routes import bp
@@ -10,6 +13,7 @@ from routes import bp
 from auth import auth_bp
 # from invoice_config_routes import invoice_config_bp
 from item_modules.item_routes import item_bp
+from invoice_json_routes import invoice_json_routes
 # from invoice_config_routes import invoice_config_bp
 from routes import bp
 
@@ -19,13 +23,14 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
-    # Disable alphabetical sorting of JSON keys to preserve OTM field order
-    app.json.sort_keys = False
+    # orjson encoder; keys stay unsorted to preserve OTM field order
+    app.json = OrjsonProvider(app)
 
     # =============================
     # Enable CORS
     # =============================
-    CORS(app)
+    # X-Next-Cursor: keyset pagination of /api/invoices
+    CORS(app, expose_headers=["X-Next-Cursor"])
 
     # =============================
     # Init DB & migrations
@@ -40,6 +45,8 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     # app.register_blueprint(invoice_config_bp, url_prefix="/api/invoice-config")
     app.register_blueprint(item_bp, url_prefix="/api/items")
+    # after bp: its /invoice/json/upload keeps precedence
+    app.register_blueprint(invoice_json_routes, url_prefix="/api")
 
 
 
@@ -60,6 +67,32 @@ with app.app_context():
         print("CRITICAL ERROR: /sync-fields NOT REGISTERED IN FLASK")
     print("="*50 + "\n")
 
+def reloader_watcher(debug):
+    """
+    True in the debug reloader's watcher process. The reloader runs this
+    module there and again in the child that serves requests
+    (WERKZEUG_RUN_MAIN=true), so threads started in both would run twice.
+    """
+    return debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+
+
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
+    debug = True
+
+    # background threads run once, in the serving process only; a second
+    # poller would also double the OTM load POLL_BUDGET_PER_MINUTE caps
+    if not reloader_watcher(debug):
+        # background workers for async uploads (or run: python upload_jobs.py)
+        from upload_jobs import start_job_workers
+        start_job_workers(app)
+
+        # OTM status poller (or run: python status_poller.py)
+        from status_poller import start_status_poller
+        start_status_poller(app)
+
+        # batched OTM item verification (or run: python -m item_modules.item_verifier)
+        from item_modules.item_verifier import start_item_verifier
+        start_item_verifier(app)
+
+    app.run(debug=debug, port=5000)
     app.run(debug=True, port=5000)
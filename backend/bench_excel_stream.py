@@ -0,0 +1,102 @@
+"""
+Benchmark: pd.read_excel + groupby vs streaming iter_invoice_groups.
+
+Builds a synthetic invoice workbook, then runs each reader in its own
+subprocess so peak RSS is measured independently. Every invoice group is
+passed through build_invoice_xml, like the XML upload flow (no OTM calls).
+
+Usage:
+    python bench_excel_stream.py                  # 500k rows
+    python bench_excel_stream.py --rows 50000 --lines-per-invoice 100
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+COLUMNS = [
+    "INVOICE_XID", "INVOICE_NUM", "INVOICE_DATE", "DOMAIN",
+    "SERVICE_PROVIDER", "CURRENCY", "SHIPMENT_GID", "COST_TYPE", "AMOUNT"
+]
+
+
+def build_workbook(path, rows, lines_per_invoice):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(COLUMNS)
+
+    for i in range(rows):
+        inv = i // lines_per_invoice
+        ws.append([
+            f"INV{inv:07d}", f"N{inv:07d}", "05/01/2026", "INTL",
+            "CARRIER01", "INR", f"INTL.SH{i:08d}", "FREIGHT", round(10 + i % 997 * 0.25, 2)
+        ])
+
+    wb.save(path)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode, path):
+    import pandas as pd
+    from excel_stream import iter_invoice_groups
+    from xml_builder import build_invoice_xml
+
+    start = time.perf_counter()
+    rows = invoices = 0
+
+    if mode == "stream":
+        grouped = iter_invoice_groups(path, "INVOICE_XID")
+    else:
+        grouped = pd.read_excel(path).groupby("INVOICE_XID")
+
+    for _, invoice_df in grouped:
+        build_invoice_xml(invoice_df)
+        rows += len(invoice_df)
+        invoices += 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{mode:<8} rows={rows:<8} invoices={invoices:<6} "
+        f"time={elapsed:7.2f}s  rows/sec={rows / elapsed:10.0f}  "
+        f"peak_rss={peak_rss_mb():8.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--lines-per-invoice", type=int, default=50)
+    parser.add_argument("--mode", choices=["pandas", "stream"])
+    parser.add_argument("--file")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_invoices.xlsx")
+        print(f"Building {args.rows} rows ({args.lines_per_invoice} lines/invoice)...")
+        build_workbook(path, args.rows, args.lines_per_invoice)
+        print(f"Workbook size: {os.path.getsize(path) / (1024 * 1024):.1f} MB\n")
+
+        for mode in ("pandas", "stream"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--file", path],
+                check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__))
+            )
+
+
+if __name__ == "__main__":
+    main()
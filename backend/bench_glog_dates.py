@@ -0,0 +1,97 @@
+"""
+Benchmark: date normalization for GLogDate values.
+
+Compares, on one date column:
+  per-value   dateutil.parse(dayfirst=True) on every value (the old to_glog_date)
+  memoized    to_glog_date() per value, dateutil results memoized
+  column      normalize_dates() once, then formatting each distinct date
+
+Outputs are checked against the per-value parser (values that fall back
+to the current time are compared by position only).
+
+Usage:
+    python bench_glog_dates.py
+    python bench_glog_dates.py --rows 10000 100000 --repeat 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from dateutil import parser as date_parser
+
+from xml_builder import GLOG_DATE_FORMAT, normalize_dates, parse_date_text, to_glog_date
+
+FALLBACK = "<now>"
+
+
+def legacy_to_glog_date(value):
+    if not value or str(value).strip().lower() in ["none", "missing", ""]:
+        return FALLBACK
+    try:
+        return date_parser.parse(str(value), dayfirst=True).strftime("%Y%m%d%H%M%S")
+    except Exception:
+        return FALLBACK
+
+
+def make_column(rows):
+    rng = np.random.default_rng(7)
+    days = pd.date_range("2025-01-01", periods=730, freq="D")
+
+    picks = days[rng.integers(0, len(days), rows)]
+    values = picks.strftime("%d/%m/%Y").to_numpy(dtype=object)
+
+    # a few rows in other spellings, blanks and junk
+    values[::50] = picks[::50].strftime("%d-%m-%Y %H:%M")
+    values[::101] = picks[::101].strftime("%Y-%m-%d")
+    values[::503] = ""
+    values[::997] = "TBD"
+    return pd.Series(values)
+
+
+def run_column(values):
+    dates, fallbacks = normalize_dates(values)
+
+    # formatted once per distinct date, like the parsing
+    codes, distinct = pd.factorize(dates)
+    texts = np.append(distinct.strftime(GLOG_DATE_FORMAT).to_numpy(dtype=object), FALLBACK)
+    return texts[codes].tolist(), fallbacks
+
+
+def best_of(fn, values, repeat):
+    best = None
+    for _ in range(repeat):
+        parse_date_text.cache_clear()
+        start = time.perf_counter()
+        result = fn(values)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'per-value':>10} {'column':>10} {'speedup':>8} {'fallbacks':>10}  identical")
+    for rows in args.rows:
+        values = make_column(rows)
+
+        legacy_time, expected = best_of(lambda v: [legacy_to_glog_date(x) for x in v], values, 1)
+        column_time, (actual, fallbacks) = best_of(run_column, values, args.repeat)
+
+        print(
+            f"{rows:>8} {legacy_time:>9.3f}s {column_time:>9.3f}s "
+            f"{legacy_time / column_time:>7.1f}x {fallbacks:>10}  {expected == actual}"
+        )
+
+    memo_time, _ = best_of(
+        lambda v: [to_glog_date(x) for x in v], make_column(args.rows[-1]), 1
+    )
+    print(f"\nto_glog_date per value, memoized ({args.rows[-1]} rows): {memo_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: build_invoice_json_from_dataframe (columnar) vs
+build_invoice_json_from_dataframe_rowwise.
+
+Checks both builders produce the same JSON (the invoiceXid suffix and the
+timestamps differ per call, so they are masked) and times them on 10k and
+100k lines.
+
+Usage:
+    python bench_json_builder.py
+    python bench_json_builder.py --lines 1000 5000 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+import numpy as np
+
+from bench_xml_builder import make_invoice
+from json_builder import (
+    build_invoice_json_from_dataframe,
+    build_invoice_json_from_dataframe_rowwise
+)
+
+
+def masked_json(payload):
+    payload = dict(payload, invoiceXid=None, invoiceDate=None, dateReceived=None)
+    # default=repr keeps any NumPy scalar type visible in the comparison
+    return json.dumps(payload, default=repr)
+
+
+def best_of(fn, df, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # column dump
+            payload = fn(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, payload
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'rowwise':>10} {'columnar':>10} {'speedup':>8}  identical")
+    for lines in args.lines:
+        df = make_invoice(lines)
+        # a few values the float() rule treats specially
+        df.loc[df.index[::89], "AMOUNT"] = None
+        df.loc[df.index[::151], "AMOUNT"] = "-0"
+        df.loc[df.index[::173], "AMOUNT"] = " 1_000 "
+        df.loc[df.index[::7], "COST_TYPE"] = np.nan
+        df.loc[df.index[::11], "COST_TYPE"] = ""
+
+        rowwise_time, expected = best_of(build_invoice_json_from_dataframe_rowwise, df, args.repeat)
+        columnar_time, actual = best_of(build_invoice_json_from_dataframe, df, args.repeat)
+
+        identical = masked_json(expected) == masked_json(actual)
+        print(
+            f"{lines:>8} {rowwise_time:>9.3f}s {columnar_time:>9.3f}s "
+            f"{rowwise_time / columnar_time:>7.1f}x  {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
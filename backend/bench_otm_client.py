@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: bare requests.get per call vs the pooled otm_client.
+
+Starts a local HTTP/1.1 keep-alive stub and times N sequential calls each
+way. Against the real OTM host the gap is larger, because every bare
+call also pays DNS, TCP and a full TLS handshake.
+
+Usage:
+    python bench_otm_client.py
+    python bench_otm_client.py --calls 2000
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import otm_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"items": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn, url, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(url).content
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/items"
+
+    bare = timed(lambda u: requests.get(u, timeout=10), url, args.calls)
+    pooled = timed(otm_client.get, url, args.calls)
+
+    print(f"calls per mode : {args.calls}")
+    print(f"bare requests  : {bare * 1000:7.3f} ms/call")
+    print(f"otm_client     : {pooled * 1000:7.3f} ms/call")
+    print(f"saved per call : {(bare - pooled) * 1000:7.3f} ms ({bare / pooled:.1f}x)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: build_invoice_xml (columnar) vs build_invoice_xml_rowwise.
+
+Checks both builders produce the same bytes (TransmissionCreateDt is the
+build time, so it is masked) and times them on 1k, 10k and 100k lines.
+
+Usage:
+    python bench_xml_builder.py
+    python bench_xml_builder.py --lines 1000 5000 --repeat 5
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from xml_builder import build_invoice_xml, build_invoice_xml_rowwise
+
+CREATE_DT = re.compile(rb"<otm:TransmissionCreateDt>.*?</otm:TransmissionCreateDt>", re.S)
+
+
+def make_invoice(lines):
+    rng = np.random.default_rng(42)
+    amounts = rng.uniform(1, 5000, lines).round(2).astype(object)
+    amounts[::97] = np.nan
+    amounts[::211] = "n/a"
+
+    return pd.DataFrame({
+        "INVOICE_XID": "INV0000001",
+        "INVOICE_NUM": 1001,
+        "INVOICE_DATE": "05/01/2026",
+        "DOMAIN": "INTL",
+        "SERVICE_PROVIDER": "CARRIER01",
+        "CURRENCY": ["INR" if i % 13 else None for i in range(lines)],
+        "SHIPMENT_GID": [f"INTL.SH{i:08d}" for i in range(lines)],
+        "COST_TYPE": ["FREIGHT" if i % 3 else "FUEL" for i in range(lines)],
+        "AMOUNT": amounts,
+    })
+
+
+def best_of(fn, df, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        xml_bytes, _ = fn(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, xml_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'rowwise':>10} {'columnar':>10} {'speedup':>8}  identical")
+    for lines in args.lines:
+        df = make_invoice(lines)
+        old_time, old_xml = best_of(build_invoice_xml_rowwise, df, args.repeat)
+        new_time, new_xml = best_of(build_invoice_xml, df, args.repeat)
+        same = CREATE_DT.sub(b"", old_xml) == CREATE_DT.sub(b"", new_xml)
+
+        print(
+            f"{lines:>8} {old_time:>9.3f}s {new_time:>9.3f}s "
+            f"{old_time / new_time:>7.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
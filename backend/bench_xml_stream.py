@@ -0,0 +1,88 @@
+"""
+Benchmark: tree builder (build_invoice_xml) vs streaming writer
+(stream_invoice_xml) on one very large invoice.
+
+Each builder runs in its own subprocess so peak RSS is measured
+independently; the baseline RSS after building the DataFrame is
+reported too, so the builder's own share is visible. The streaming
+output is checked against the tree output (TransmissionCreateDt masked).
+
+Usage:
+    python bench_xml_stream.py                    # 50k and 200k lines
+    python bench_xml_stream.py --lines 20000 --repeat 3
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+from bench_xml_builder import make_invoice, CREATE_DT
+
+MODES = ("tree", "tree+text", "stream", "stream+text")
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode, lines, repeat):
+    from xml_builder import build_invoice_xml, stream_invoice_xml, xml_text
+
+    df = make_invoice(lines)
+    base = peak_rss_mb()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if mode.startswith("tree"):
+            xml_bytes, xml_string = build_invoice_xml(df)
+        else:
+            xml_bytes = stream_invoice_xml(df)
+            if mode.endswith("+text"):
+                xml_string = xml_text(xml_bytes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(
+        f"{mode:<12} lines={lines:<8} time={best:7.3f}s  "
+        f"peak_rss={peak_rss_mb():8.1f} MB  (dataframe {base:.1f} MB)  "
+        f"xml={len(xml_bytes) / (1024 * 1024):.1f} MB"
+    )
+
+
+def check_identical(lines):
+    from xml_builder import build_invoice_xml, stream_invoice_xml
+
+    df = make_invoice(lines)
+    tree_bytes, _ = build_invoice_xml(df)
+    return CREATE_DT.sub(b"", tree_bytes) == CREATE_DT.sub(b"", stream_invoice_xml(df))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.lines[0], args.repeat)
+        return
+
+    print(f"identical output: {check_identical(1_000)}\n")
+
+    for lines in args.lines:
+        for mode in MODES:
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode,
+                 "--lines", str(lines), "--repeat", str(args.repeat)],
+                check=True
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
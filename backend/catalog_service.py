@@ -0,0 +1,105 @@
+"""
+otm_catalog.json, parsed once per process.
+
+The file is re-read only when its mtime changes (or when reload_catalog()
+is called, e.g. by seed_catalog.py). Each load also builds the
+name -> classification index and the dashboard module list, so
+/dashboard/modules and /metadata/sync/<object> do no parsing or scanning.
+"""
+import copy
+import json
+import os
+import threading
+
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), "otm_catalog.json")
+
+EMPTY_CATALOG = {"MASTER": [], "TRANSACTION": [], "POWER": []}
+
+_state = None
+_lock = threading.Lock()
+
+
+def catalog_mtime():
+    try:
+        return os.stat(CATALOG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def build_state(mtime):
+    if mtime is None:
+        catalog = copy.deepcopy(EMPTY_CATALOG)
+    else:
+        with open(CATALOG_FILE, "r") as f:
+            catalog = json.load(f)
+
+    classification = {}
+    modules = {}
+
+    for category, items in catalog.items():
+        modules[category] = []
+        for item in items:
+            # first category wins, like the old linear scan
+            classification.setdefault(item["name"], category)
+
+            # sync fields are filled in per request
+            module = item.copy()
+            module.update({
+                "title": item.get("display", item["name"]),
+                "path": item.get("path", f"/{item['name']}"),
+                "last_synced": None,
+                "is_synced": False,
+                "is_app": item.get("is_app", False)
+            })
+            modules[category].append(module)
+
+    return {
+        "mtime": mtime,
+        "catalog": catalog,
+        "classification": classification,
+        "modules": modules
+    }
+
+
+def get_state():
+    global _state
+
+    mtime = catalog_mtime()
+    state = _state
+    if state is not None and state["mtime"] == mtime:
+        return state
+
+    with _lock:
+        if _state is None or _state["mtime"] != mtime:
+            _state = build_state(mtime)
+        return _state
+
+
+def reload_catalog():
+    """Forces a re-read of otm_catalog.json; returns the catalog"""
+    global _state
+    with _lock:
+        _state = build_state(catalog_mtime())
+        return _state["catalog"]
+
+
+# ============================================================
+# LOOKUPS
+# ============================================================
+def load_otm_catalog():
+    """Parsed catalog; shared, do not modify"""
+    return get_state()["catalog"]
+
+
+def get_classification_from_catalog(object_name):
+    return get_state()["classification"].get(object_name, "TRANSACTION")
+
+
+def catalog_version():
+    """Changes whenever the catalog is reloaded from a modified file"""
+    return get_state()["mtime"]
+
+
+def get_catalog_modules():
+    """{category: [module, ...]} without sync status; shared, copy before changing"""
+    return get_state()["modules"]
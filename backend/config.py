@@ -34,6 +34,125 @@ class Config:
     )
 
 
+    # ================= EXCEL UPLOADS =================
+    # Read uploads row by row instead of pd.read_excel().
+    # Can also be switched on per request with form field streaming=true
+    EXCEL_STREAMING = False
+
+    # Flush pending Invoice rows every N invoices while streaming
+    EXCEL_STREAM_FLUSH_EVERY = 50
+
+
+    # ================= OTM HTTP CLIENT =================
+    # Shared pooled session used for every OTM call (otm_client.py)
+    OTM_POOL_SIZE = 20
+    OTM_CONNECT_TIMEOUT = 10
+
+    # Read timeouts (seconds)
+    OTM_TIMEOUT = 120           # invoice / item submission
+    OTM_QUERY_TIMEOUT = 60      # DBXML queries, metadata-catalog
+    OTM_LOOKUP_TIMEOUT = 15     # item metadata, verification, lookups
+
+    # Retries for idempotent calls, jittered exponential backoff
+    OTM_RETRIES = 3
+    OTM_RETRY_BASE_DELAY = 0.5
+    OTM_RETRY_MAX_DELAY = 10
+
+
+    # OTM item metadata-catalog cache: revalidated after the TTL,
+    # retried after a failed fetch (stale schemas are served meanwhile)
+    ITEM_METADATA_TTL_SECONDS = 3600
+    ITEM_METADATA_RETRY_SECONDS = 30
+
+    # Per-process FieldConfig snapshot (field_config_cache.py): reloaded
+    # after a save in the same process, or once it is this old
+    FIELD_CONFIG_RECHECK_SECONDS = 5
+
+
+    # Oracle caps IN (...) lists at 1000 entries per DBXML query
+    OTM_DBXML_IN_CHUNK = 1000
+
+    # Most invoices one POST /api/refresh may touch
+    REFRESH_BULK_LIMIT = 2000
+
+
+    # ================= STATUS POLLER =================
+    # Background refresh of invoices until they reach a terminal status
+    STATUS_POLLER_ENABLED = True
+    POLL_TERMINAL_STATUSES = ["COMPLETE", "ERROR"]
+
+    # Max invoices polled per minute (caps the load on OTM), per batch.
+    # The budget is per poller, so run a single one: app.py starts it in
+    # the serving process only, or run python status_poller.py on its own
+    POLL_BUDGET_PER_MINUTE = 600
+    POLL_BATCH_SIZE = 200
+    POLL_TICK_SECONDS = 10
+
+    # Poll interval = invoice age * factor, within [min, max]
+    POLL_BACKOFF_FACTOR = 0.2
+    POLL_MIN_INTERVAL_SECONDS = 15
+    POLL_MAX_INTERVAL_SECONDS = 1800
+
+    # Give up on invoices older than this
+    POLL_MAX_AGE_HOURS = 72
+
+
+    # ================= OTM SUBMISSION =================
+    # Invoices posted to OTM in parallel per upload (1 = one at a time)
+    OTM_SUBMIT_WORKERS = 4
+
+    # Pack up to N invoices into one Transmission (1 = one per invoice),
+    # starting a new one before the XML would pass OTM_PACK_MAX_BYTES
+    OTM_PACK_INVOICES = 1
+    OTM_PACK_MAX_BYTES = 5 * 1024 * 1024
+
+    # Invoices with at least this many rows are written with the streaming
+    # XML writer (much lower peak memory, slower); None = never.
+    # Ignored when OTM_PACK_INVOICES > 1
+    XML_STREAM_MIN_LINES = 20000
+
+
+    # metadata-catalog objects fetched in parallel by /api/metadata/sync-all
+    METADATA_SYNC_WORKERS = 8
+
+    # Items pushed to OTM in parallel by POST /api/items/import
+    ITEM_IMPORT_WORKERS = 8
+
+    # Confirming item upserts: "batch" = one q=itemGid in (...) query per
+    # ITEM_VERIFY_CHUNK items (item_verifier.py), "item" = one GET per item
+    ITEM_VERIFY_MODE = "batch"
+    ITEM_VERIFY_CHUNK = 100
+    ITEM_VERIFY_BATCH_SIZE = 500
+    ITEM_VERIFY_POLL_SECONDS = 5
+
+
+    # ================= UPLOAD JOBS =================
+    # Queue uploads for background workers instead of processing them in
+    # the request (form field async=true overrides per request)
+    UPLOAD_ASYNC = False
+    UPLOAD_JOB_WORKERS = 2
+    UPLOAD_JOB_POLL_SECONDS = 2
+    # a RUNNING job without progress for this long is marked FAILED
+    UPLOAD_JOB_STALE_SECONDS = 900
+
+
+    # ================= LISTINGS =================
+    # Page size for GET /api/invoices (keyset pagination): the default
+    # when no limit is given, and the cap on ?limit=N
+    INVOICE_PAGE_DEFAULT_LIMIT = 200
+    INVOICE_PAGE_MAX_LIMIT = 1000
+
+
+    # Cache-Control max-age for ETag'd config endpoints (http_cache.py);
+    # 0 = browsers revalidate every time and usually get a 304
+    HTTP_CACHE_MAX_AGE = 0
+
+
+    # ================= TEMPLATES =================
+    # Parsed invoice templates kept per process (template_store.py)
+    TEMPLATE_CACHE_SIZE = 128
+
+
     # ================= AUTH =================
     OTM_USERNAME = "INTL.INT01"
     OTM_PASSWORD = "changeme"
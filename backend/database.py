@@ -1,5 +1,16 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy.dialects import postgresql, sqlite
 
 db = SQLAlchemy()
 migrate = Migrate()
+
+
+def upsert_insert(table):
+    """
+    INSERT with on_conflict_do_update / on_conflict_do_nothing for the
+    session's database: Postgres in production, SQLite in the tests.
+    """
+    if db.session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -0,0 +1,92 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+
+# ============================================================
+# STREAMING EXCEL READER
+# ============================================================
+# pd.read_excel() materialises the whole workbook before any work
+# starts. These helpers walk the sheet row by row (openpyxl read-only
+# mode) so only the invoice currently being collected is held in memory.
+
+
+def iter_excel_rows(excel_file, sheet_name=None):
+    """
+    Yields (columns, values) for every data row of the sheet.
+    The first row is treated as the header, like pd.read_excel().
+    """
+    wb = load_workbook(excel_file, read_only=True, data_only=True)
+
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = [
+            str(c) if c is not None else f"Unnamed: {i}"
+            for i, c in enumerate(header)
+        ]
+        width = len(columns)
+
+        for values in rows:
+            # read-only sheets can report short or fully blank rows
+            if all(v is None for v in values):
+                continue
+            if len(values) < width:
+                values = tuple(values) + (None,) * (width - len(values))
+            yield columns, values[:width]
+
+    finally:
+        wb.close()
+
+
+def iter_invoice_groups(excel_file, key_column="INVOICE_XID", sheet_name=None):
+    """
+    Yields (invoice_key, DataFrame) for each invoice as soon as its rows end.
+
+    Rows of one invoice must be contiguous in the sheet. A key that shows up
+    again after its group was handed out raises ValueError instead of
+    silently splitting the invoice in two.
+
+    key_column may also be a list of candidate columns (a template's mapped
+    column, then the default); the first one in the header is used.
+    """
+    candidates = [key_column] if isinstance(key_column, str) else list(key_column)
+    columns = None
+    current_key = None
+    current_rows = []
+    finished = set()
+
+    for cols, values in iter_excel_rows(excel_file, sheet_name):
+        if columns is None:
+            columns = cols
+            key_column = next((c for c in candidates if c in columns), None)
+            if key_column is None:
+                raise ValueError(f"Column '{candidates[-1]}' not found in Excel sheet")
+            key_idx = columns.index(key_column)
+
+        key = values[key_idx]
+
+        # pandas groupby drops rows without a key, keep that behaviour
+        if key is None or (isinstance(key, str) and not key.strip()):
+            continue
+
+        if current_rows and key != current_key:
+            finished.add(current_key)
+            yield current_key, pd.DataFrame(current_rows, columns=columns)
+            current_rows = []
+
+        if key in finished:
+            raise ValueError(
+                f"Rows for {key_column}={key} are not contiguous; "
+                "sort the sheet by invoice or disable streaming"
+            )
+
+        current_key = key
+        current_rows.append(values)
+
+    if current_rows:
+        yield current_key, pd.DataFrame(current_rows, columns=columns)
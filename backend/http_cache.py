@@ -0,0 +1,54 @@
+"""
+Conditional GET (ETag / 304) for read-mostly JSON endpoints.
+
+A view passes a cheap version of its underlying data (file mtime, a
+MAX(updated_at), a cache counter...) and a function that builds the
+body. The strong ETag is derived from the version alone, so a matching
+If-None-Match is answered with 304 before the body is built, and an
+unchanged body is served from memory without being encoded again.
+"""
+import hashlib
+import threading
+
+from flask import Response, current_app, request
+
+_bodies = {}  # key -> (version, encoded body)
+_lock = threading.Lock()
+
+
+def make_etag(key, version):
+    return hashlib.sha1(f"{key}:{version}".encode("utf-8")).hexdigest()
+
+
+def cache_control(max_age):
+    if max_age:
+        return f"private, max-age={max_age}, must-revalidate"
+    # may be stored, but must be revalidated (cheap 304) before reuse
+    return "private, no-cache"
+
+
+def conditional_json(key, version, build, max_age=None):
+    """
+    key     endpoint name, one body per key is kept
+    version anything with a stable str(); changes when the data does
+    build   returns the JSON-serializable body, called only when needed
+    """
+    if max_age is None:
+        max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 0)
+
+    etag = make_etag(key, version)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        cached = _bodies.get(key)
+        if cached is not None and cached[0] == version:
+            response = Response(cached[1], mimetype=current_app.json.mimetype)
+        else:
+            response = current_app.json.response(build())
+            with _lock:
+                _bodies[key] = (version, response.get_data())
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control(max_age)
+    return response
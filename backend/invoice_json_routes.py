@@ -1,10 +1,12 @@
-import requests
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from config import Config
 from models import InvoiceJson
 from database import db
+from routes import encode_cursor, decode_cursor
 import json
 
+import otm_client
+
 invoice_json_routes = Blueprint("invoice_json_routes", __name__)
 
 
@@ -42,12 +44,11 @@ def create_invoice():
             "application/vnd.oracle.resource+json"
     }
 
-    response = requests.post(
+    response = otm_client.post(
         f"{Config.OTM_REST_URL}/invoices",
         json=payload,
         headers=headers,
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     if response.status_code in (200, 201):
@@ -67,26 +68,84 @@ def create_invoice():
 # ======================================================
 # LIST ALL JSON INVOICES
 # ======================================================
+# Only the requested columns are selected, so request_json /
+# response_json are never read unless listed in fields=.
+#
+# Query args (all optional):
+#   fields=id,status,request_json   keys of each row (default: LIST_FIELDS)
+#   limit=N, cursor=...             keyset page on (created_at, id), newest
+#                                   first; next cursor in X-Next-Cursor
+LIST_COLUMNS = {
+    "id": InvoiceJson.id,
+    "invoice_xid": InvoiceJson.invoice_xid,
+    "invoice_number": InvoiceJson.invoice_number,
+    "invoice_gid": InvoiceJson.invoice_gid,
+    "status": InvoiceJson.status,
+    "error_message": InvoiceJson.error_message,
+    "created_at": InvoiceJson.created_at,
+    "request_json": InvoiceJson.request_json,
+    "response_json": InvoiceJson.response_json,
+}
+
+LIST_FIELDS = [
+    "id", "invoice_xid", "invoice_number", "invoice_gid", "status", "error_message"
+]
+
+
 @invoice_json_routes.route("/invoice/json", methods=["GET"])
 def list_invoices():
 
-    rows = InvoiceJson.query.order_by(
-        InvoiceJson.created_at.desc()
-    ).all()
-
-    return jsonify([
-        {
-            "id": r.id,
-            "invoice_xid": r.invoice_xid,
-            "invoice_number": r.invoice_number,
-            "invoice_gid": r.invoice_gid,
-            "status": r.status,
-            "error_message": r.error_message,
-            "request_json": r.request_json
-        }
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+    fields = list(dict.fromkeys(fields)) or LIST_FIELDS
+
+    unknown = [f for f in fields if f not in LIST_COLUMNS]
+    if unknown:
+        return {"error": f"Unknown fields: {', '.join(unknown)}"}, 400
+
+    try:
+        cursor = request.args.get("cursor")
+        after = decode_cursor(cursor) if cursor else None
+        limit = request.args.get("limit", type=int)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    stmt = db.select(
+        *[LIST_COLUMNS[f].label(f) for f in fields],
+        # cursor keys, whether listed or not
+        InvoiceJson.id.label("_id"),
+        InvoiceJson.created_at.label("_created_at")
+    )
+
+    if after:
+        created_at, last_id = after
+        stmt = stmt.where(
+            db.tuple_(InvoiceJson.created_at, InvoiceJson.id) < db.tuple_(created_at, last_id)
+        )
+
+    stmt = stmt.order_by(InvoiceJson.created_at.desc(), InvoiceJson.id.desc())
+
+    if limit is not None:
+        limit = max(1, min(limit, current_app.config["INVOICE_PAGE_MAX_LIMIT"]))
+        # one extra row tells whether another page follows
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.session.execute(stmt).all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]._created_at, rows[-1]._id)
+
+    response = jsonify([
+        {f: getattr(r, f) for f in fields}
         for r in rows
     ])
 
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return response
+
 
 # ======================================================
 # GET INVOICE FROM OTM
@@ -101,13 +160,12 @@ def get_invoice_from_otm(id):
 
     gid = extract_gid(inv.invoice_gid)
 
-    response = requests.get(
+    response = otm_client.get(
         f"{Config.OTM_REST_URL}/invoices/{gid}",
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
         headers={
             "Accept": "application/vnd.oracle.resource+json"
         },
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     return response.json(), response.status_code
@@ -134,12 +192,11 @@ def update_invoice_otm(id):
             "application/vnd.oracle.resource+json"
     }
 
-    response = requests.patch(
+    response = otm_client.patch(
         f"{Config.OTM_REST_URL}/invoices/{gid}",
         json=payload,
         headers=headers,
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     if response.status_code in (200, 204):
@@ -197,12 +254,11 @@ def upload_invoice_json():
             "application/vnd.oracle.resource+json"
     }
 
-    response = requests.post(
+    response = otm_client.post(
         f"{Config.OTM_REST_URL}/invoices",
         json=payload,
         headers=headers,
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     return response.json(), response.status_code
@@ -1,13 +1,15 @@
 from flask import Blueprint, jsonify, request, send_file
 import json
+import os
 from openpyxl import Workbook
 from flask import Blueprint, jsonify, request, send_file, current_app
-import requests
-from requests.auth import HTTPBasicAuth
+
+import otm_client
+from http_cache import conditional_json
 
 invoice_template_bp = Blueprint("invoice_template_bp", __name__)
 
-FIELDS_FILE = "invoice_template_fields.json"
+FIELDS_FILE = os.path.join(os.path.dirname(__file__), "invoice_template_fields.json")
 
 
 # ===============================
@@ -15,8 +17,12 @@ FIELDS_FILE = "invoice_template_fields.json"
 # ===============================
 @invoice_template_bp.route("/invoice-template/fields", methods=["GET"])
 def get_invoice_template_fields():
-    with open(FIELDS_FILE, "r") as f:
-        return jsonify(json.load(f))
+    # the file is only re-read when its mtime changes
+    def build():
+        with open(FIELDS_FILE, "r") as f:
+            return json.load(f)
+
+    return conditional_json("invoice-template-fields", os.stat(FIELDS_FILE).st_mtime_ns, build)
 # ===============================
 # GET OTM INVOICE METADATA
 # ===============================
@@ -24,13 +30,10 @@ def get_invoice_template_fields():
 def get_otm_invoice_metadata():
     url = current_app.config["OTM_INVOICE_METADATA_URL"]
 
-    response = requests.get(
+    response = otm_client.get(
         url,
-        auth=HTTPBasicAuth(
-            current_app.config["OTM_USERNAME"],
-            current_app.config["OTM_PASSWORD"]
-        ),
-        headers={"Accept": "application/json"}
+        headers={"Accept": "application/json"},
+        timeout=current_app.config["OTM_QUERY_TIMEOUT"]
     )
 
     return jsonify(response.json()), response.status_code
@@ -66,23 +69,14 @@ def generate_invoice_template():
 
 
 # ===============================
-# TEMPLATE LIST & SAVE (JSON)
+# TEMPLATE LIST & SAVE (DB)
 # ===============================
-TEMPLATES_FILE = "invoice_templates.json"
-import os
-from uuid import uuid4
+from database import db
+from template_store import list_templates, create_template, templates_version
 
 @invoice_template_bp.route("/invoice-template/templates", methods=["GET"])
 def get_templates():
-    if not os.path.exists(TEMPLATES_FILE):
-        return jsonify([])
-    
-    try:
-        with open(TEMPLATES_FILE, "r") as f:
-            templates = json.load(f)
-            return jsonify(templates)
-    except Exception:
-        return jsonify([])
+    return conditional_json("invoice-templates", templates_version(), list_templates)
 
 @invoice_template_bp.route("/invoice-template/templates", methods=["POST"])
 def save_template():
@@ -94,26 +88,8 @@ def save_template():
     if not name or not fields:
         return jsonify({"error": "Missing name or fields"}), 400
 
-    # Load existing
-    templates = []
-    if os.path.exists(TEMPLATES_FILE):
-        try:
-            with open(TEMPLATES_FILE, "r") as f:
-                templates = json.load(f)
-        except:
-            templates = []
-
-    # New Template
-    new_template = {
-        "id": str(uuid4()),
-        "name": name,
-        "fields": fields,
-        # "createdAt": ... 
-    }
-    
-    templates.append(new_template)
-    
-    with open(TEMPLATES_FILE, "w") as f:
-        json.dump(templates, f, indent=2)
+    # New Template (one row per save; no shared file to rewrite)
+    new_template = create_template(name, fields)
+    db.session.commit()
 
-    return jsonify({"message": "Template saved", "id": new_template["id"]})
+    return jsonify({"message": "Template saved", "id": new_template.id})
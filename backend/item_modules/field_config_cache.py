@@ -0,0 +1,75 @@
+"""
+In-process snapshot of the FieldConfig table.
+
+Item validation and GET /api/items/config read the snapshot instead of
+querying field_configs on every call. The snapshot is keyed by a version
+counter: upload_template_json and sync_fields_from_otm bump it after
+committing, and the next reader reloads once.
+
+The counter only sees changes made through this process, so a snapshot
+is also reloaded once it is FIELD_CONFIG_RECHECK_SECONDS old; a change
+saved through another worker shows up here within that time.
+"""
+import hashlib
+import json
+import threading
+import time
+
+from flask import current_app
+
+from .item_model import FieldConfig
+
+_version = 0
+_snapshot = None
+_lock = threading.Lock()
+
+
+def bump_field_config_version():
+    """Call after committing a FieldConfig change"""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def load_snapshot(version):
+    configs = FieldConfig.query.order_by(FieldConfig.id.asc()).all()
+    data = [c.to_dict() for c in configs]
+
+    return {
+        "version": version,
+        "loaded_at": time.monotonic(),
+        # compiled mandatory check: (key, label) of displayed mandatory fields
+        "mandatory": [
+            (c.key, c.label or c.key)
+            for c in configs if c.display and c.mandatory
+        ],
+        # /api/items/config body; its content hash is the HTTP data version
+        "data": data,
+        "etag": hashlib.sha1(
+            json.dumps(data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+    }
+
+
+def is_current(snapshot):
+    if snapshot is None or snapshot["version"] != _version:
+        return False
+    age = time.monotonic() - snapshot["loaded_at"]
+    return age < current_app.config["FIELD_CONFIG_RECHECK_SECONDS"]
+
+
+def get_field_config_snapshot():
+    global _snapshot
+
+    snapshot = _snapshot
+    if is_current(snapshot):
+        return snapshot
+
+    with _lock:
+        if not is_current(_snapshot):
+            _snapshot = load_snapshot(_version)
+        return _snapshot
+
+
+def get_mandatory_fields():
+    return get_field_config_snapshot()["mandatory"]
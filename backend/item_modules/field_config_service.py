@@ -0,0 +1,104 @@
+from database import db, upsert_insert
+from .item_model import FieldConfig
+
+# columns set from the frontend field configuration
+EDITABLE = ("label", "display", "mandatory", "default_value")
+
+
+# ======================================================
+# SET-BASED FIELD CONFIG WRITES
+# ======================================================
+# Existing rows are read in one SELECT, the diff is computed in memory
+# and every changed or new row is written by one INSERT ... ON CONFLICT,
+# so the statement count does not grow with the number of fields.
+
+def load_field_configs(keys):
+    rows = db.session.execute(
+        db.select(FieldConfig.key, *(getattr(FieldConfig, c) for c in EDITABLE))
+        .where(FieldConfig.key.in_(keys))
+    ).all()
+    return {r.key: dict(zip(EDITABLE, r[1:])) for r in rows}
+
+
+def upsert_field_configs(entries):
+    """
+    entries are frontend field configurations; a missing attribute keeps
+    the stored value. Returns {"inserted", "updated", "unchanged"}.
+    """
+    keys = list(dict.fromkeys(e.get("key") for e in entries if e.get("key")))
+    if not keys:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    existing = load_field_configs(keys)
+    merged = {}
+
+    # applied in order, so a repeated key behaves like successive saves
+    for entry in entries:
+        key = entry.get("key")
+        if not key:
+            continue
+
+        current = merged.get(key) or existing.get(key) or dict.fromkeys(EDITABLE)
+
+        # Map frontend keys to DB columns
+        merged[key] = {
+            "label": entry.get("label", current["label"]),
+            "display": bool(entry.get("display", current["display"])),
+            "mandatory": bool(entry.get("mandatory", current["mandatory"])),
+            "default_value": entry.get("defaultValue", entry.get("default_value", current["default_value"]))
+        }
+
+    changed = [
+        dict(values, key=key)
+        for key, values in merged.items()
+        if existing.get(key) != values
+    ]
+
+    if changed:
+        stmt = upsert_insert(FieldConfig)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FieldConfig.key],
+            set_={c: getattr(stmt.excluded, c) for c in EDITABLE}
+        )
+        db.session.execute(stmt, changed)
+
+    inserted = sum(1 for row in changed if row["key"] not in existing)
+
+    return {
+        "inserted": inserted,
+        "updated": len(changed) - inserted,
+        "unchanged": len(merged) - len(changed)
+    }
+
+
+def add_missing_field_configs(keys):
+    """Inserts hidden, optional configs for keys not configured yet"""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    existing = set(
+        db.session.execute(
+            db.select(FieldConfig.key).where(FieldConfig.key.in_(keys))
+        ).scalars()
+    )
+
+    missing = [
+        {
+            "key": key,
+            "label": "",
+            "default_value": "",
+            "display": False,
+            "mandatory": False,
+            "section": "core"
+        }
+        for key in keys if key not in existing
+    ]
+
+    if missing:
+        stmt = upsert_insert(FieldConfig).on_conflict_do_nothing(
+            index_elements=[FieldConfig.key]
+        )
+        db.session.execute(stmt, missing)
+
+    return {"inserted": len(missing), "updated": 0, "unchanged": len(existing)}
@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+from flask import current_app
+
+from database import db, upsert_insert
+from task_pool import map_in_order
+from .item_model import Item
+from .field_config_cache import get_mandatory_fields
+from .item_service import (
+    validate_mandatory,
+    normalize_item,
+    post_to_otm,
+    verify_in_otm,
+    verify_items_in_otm,
+    mark_verified,
+    batch_verification
+)
+
+
+# ======================================================
+# 1. READ CSV / EXCEL / JSON-LINES
+# ======================================================
+
+def read_item_rows(file, filename):
+    """List of field dicts, one per item; blank cells are dropped"""
+    ext = os.path.splitext(filename or "")[1].lower()
+
+    if ext in (".jsonl", ".ndjson", ".json"):
+        rows = []
+        for n, line in enumerate(file.read().decode("utf-8-sig").splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {n}: invalid JSON ({e})")
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {n}: expected a JSON object")
+            rows.append(row)
+        return rows
+
+    if ext == ".csv":
+        df = pd.read_csv(file, dtype=str, keep_default_na=False)
+    elif ext in (".xlsx", ".xls"):
+        df = pd.read_excel(file, dtype=str)
+    else:
+        raise ValueError("Unsupported file type (use .csv, .xlsx or .jsonl)")
+
+    df = df.fillna("")
+    return [
+        {k: v for k, v in row.items() if v != ""}
+        for row in df.to_dict("records")
+    ]
+
+
+# ======================================================
+# 2. VALIDATE EVERYTHING UP FRONT
+# ======================================================
+
+def validate_rows(rows, mandatory_fields):
+    """Returns (records, results); invalid rows are reported, not imported"""
+    results = [None] * len(rows)
+    by_gid = {}
+
+    for n, data in enumerate(rows):
+        try:
+            validate_mandatory(data, mandatory_fields)
+            record = normalize_item(data)
+        except ValueError as e:
+            results[n] = {"row": n + 1, "item_gid": None, "status": "INVALID", "error": str(e)}
+            continue
+
+        # same item twice in one file: the last row wins
+        previous = by_gid.get(record["item_gid"])
+        if previous is not None:
+            results[previous["row"]] = {
+                "row": previous["row"] + 1,
+                "item_gid": record["item_gid"],
+                "status": "SKIPPED",
+                "error": f"Superseded by row {n + 1}"
+            }
+
+        record["row"] = n
+        by_gid[record["item_gid"]] = record
+
+    return list(by_gid.values()), results
+
+
+# ======================================================
+# 3. LOCAL UPSERT (ONE INSERT ... ON CONFLICT)
+# ======================================================
+
+def upsert_items(records):
+    stmt = upsert_insert(Item)
+    stmt = stmt.on_conflict_do_update(
+        # uq_item_gid
+        index_elements=[Item.item_gid],
+        set_={
+            "item_xid": stmt.excluded.item_xid,
+            "item_name": stmt.excluded.item_name,
+            "domain_name": stmt.excluded.domain_name,
+            "payload": stmt.excluded.payload,
+            "otm_sync_status": "PENDING",
+            "updated_at": db.func.now()
+        }
+    )
+
+    db.session.execute(stmt, [
+        {
+            "item_gid": r["item_gid"],
+            "item_xid": r["item_xid"],
+            "item_name": r["item_name"],
+            "domain_name": r["domain_name"],
+            "payload": r["payload"],
+            "otm_sync_status": "PENDING"
+        }
+        for r in records
+    ])
+
+
+def set_sync_status(gids, status, chunk=5000):
+    # chunked to stay far below the driver's bind parameter limit
+    for i in range(0, len(gids), chunk):
+        db.session.execute(
+            db.update(Item)
+            .where(Item.item_gid.in_(gids[i:i + chunk]))
+            .values(otm_sync_status=status, updated_at=db.func.now())
+        )
+
+
+# ======================================================
+# 4. BULK IMPORT (LOCAL + CONCURRENT OTM SYNC)
+# ======================================================
+
+def import_items(rows):
+    started = time.perf_counter()
+    app = current_app._get_current_object()
+
+    records, results = validate_rows(rows, get_mandatory_fields())
+    batch_verify = batch_verification()
+
+    if records:
+        upsert_items(records)
+        db.session.commit()
+
+    def push(record):
+        # worker threads need their own app context for config / metadata
+        with app.app_context():
+            response = post_to_otm(SimpleNamespace(**record))
+
+            if not (response is not None and response.status_code in [200, 201, 204]):
+                return "FAILED", response.text if response is not None else "OTM timeout"
+
+            if batch_verify:
+                return "VERIFYING", None
+
+            if not verify_in_otm(record["item_gid"]):
+                return "FAILED", "OTM accepted request but item not persisted"
+
+            return "SUCCESS", None
+
+    synced, accepted, failed = [], [], []
+    pushes = map_in_order(
+        push,
+        records,
+        max_workers=current_app.config.get("ITEM_IMPORT_WORKERS", 8)
+    )
+
+    for record, outcome, ex in pushes:
+        status, error = outcome if ex is None else ("FAILED", str(ex))
+        if error:
+            logging.error(f"OTM sync failed for {record['item_gid']}: {error}")
+
+        outcomes = {"SUCCESS": synced, "VERIFYING": accepted}
+        outcomes.get(status, failed).append(record["item_gid"])
+        results[record["row"]] = {
+            "row": record["row"] + 1,
+            "item_gid": record["item_gid"],
+            "status": status,
+            "error": error
+        }
+
+    set_sync_status(synced, "SUCCESS")
+    set_sync_status(failed, "FAILED")
+
+    # accepted upserts are confirmed with one OTM query per chunk
+    if accepted:
+        try:
+            found = verify_items_in_otm(accepted)
+        except Exception as e:
+            # left for the background verifier (item_verifier.py)
+            logging.error(f"Batch verification failed: {str(e)}")
+            set_sync_status(accepted, "VERIFYING")
+        else:
+            mark_verified(accepted, found)
+            for record in records:
+                result = results[record["row"]]
+                if result["status"] != "VERIFYING":
+                    continue
+                if record["item_gid"] in found:
+                    result["status"] = "SUCCESS"
+                    synced.append(record["item_gid"])
+                else:
+                    result["status"] = "FAILED"
+                    result["error"] = "OTM accepted request but item not persisted"
+                    failed.append(record["item_gid"])
+
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        "total": len(rows),
+        "imported": len(records),
+        "invalid": sum(1 for r in results if r["status"] == "INVALID"),
+        "skipped": sum(1 for r in results if r["status"] == "SKIPPED"),
+        "synced": len(synced),
+        "failed": len(failed),
+        "verifying": sum(1 for r in results if r["status"] == "VERIFYING"),
+        "elapsed_seconds": round(elapsed, 3),
+        "items_per_second": round(len(records) / elapsed, 2) if elapsed else None,
+        "results": results
+    }
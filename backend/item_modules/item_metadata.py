@@ -0,0 +1,220 @@
+"""
+Process-wide cache of the OTM item metadata-catalog.
+
+The catalog is a large OpenAPI document; the item path only needs the
+property names of a couple of schemas. Those are kept in memory for
+ITEM_METADATA_TTL_SECONDS, then revalidated with If-None-Match /
+If-Modified-Since, so an unchanged catalog costs a 304 instead of a full
+download. Concurrent callers share one fetch (single-flight).
+
+The schema properties, ETag and Last-Modified are persisted to one
+otm_metadata_cache row (OtmMetadataCache), so a freshly started worker
+begins warm. The catalog objects in otm_object_metadata are left alone.
+The writes go through their own connection and never touch the caller's
+session.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from database import db, upsert_insert
+from models import OtmMetadataCache
+
+import otm_client
+
+# otm_metadata_cache row holding the cached schemas
+CACHE_NAME = "item_metadata_catalog"
+
+# schemas whose properties are used: "Item" filters upsert payloads,
+# "items" feeds /api/items/sync-fields
+ITEM_SCHEMAS = ("Item", "items")
+
+_entry = None  # {"schemas", "etag", "last_modified", "checked_at"}
+_retry_at = None
+_invalidated = False
+_lock = threading.Lock()
+
+
+def item_metadata_url():
+    url = current_app.config["OTM_METADATA_URL"].rstrip("/")
+    if "metadata-catalog" not in url:
+        url = f"{url}/metadata-catalog/items"
+    return url
+
+
+def extract_schemas(document):
+    """{schema: {field: (data_type, is_required)}} for ITEM_SCHEMAS"""
+    schemas = document.get("components", {}).get("schemas", {})
+    result = {}
+
+    for name in ITEM_SCHEMAS:
+        schema = schemas.get(name) or {}
+        required = set(schema.get("required", []))
+        result[name] = {
+            field: (str(spec.get("type") or "")[:50] or None, field in required)
+            for field, spec in (schema.get("properties") or {}).items()
+        }
+
+    return result
+
+
+# ============================================================
+# PERSISTENCE (OWN CONNECTION)
+# ============================================================
+def load_persisted():
+    cache = OtmMetadataCache.__table__
+
+    with db.engine.connect() as conn:
+        row = conn.execute(
+            db.select(cache).where(cache.c.name == CACHE_NAME)
+        ).first()
+
+    if row is None or row.checked_at is None:
+        return None
+
+    return {
+        # stored as JSON lists; (data_type, is_required) in memory
+        "schemas": {
+            name: {field: tuple(spec) for field, spec in (row.schemas or {}).get(name, {}).items()}
+            for name in ITEM_SCHEMAS
+        },
+        "etag": row.etag,
+        "last_modified": row.last_modified,
+        "checked_at": row.checked_at
+    }
+
+
+def persist(entry, schemas_changed):
+    """A 304 only moves checked_at; a new download replaces the row"""
+    cache = OtmMetadataCache.__table__
+
+    with db.engine.begin() as conn:
+        if not schemas_changed:
+            updated = conn.execute(
+                db.update(cache)
+                .where(cache.c.name == CACHE_NAME)
+                .values(checked_at=entry["checked_at"])
+            ).rowcount
+            if updated:
+                return
+
+        values = {
+            "etag": entry["etag"],
+            "last_modified": entry["last_modified"],
+            "schemas": entry["schemas"],
+            "checked_at": entry["checked_at"]
+        }
+        stmt = upsert_insert(cache).values(name=CACHE_NAME, **values)
+        conn.execute(stmt.on_conflict_do_update(index_elements=[cache.c.name], set_=values))
+
+
+# ============================================================
+# FETCH / REVALIDATE
+# ============================================================
+def refresh(entry):
+    """Conditional GET against OTM; returns the new entry or None on failure"""
+    headers = {"Accept": "application/json"}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = otm_client.get(
+            item_metadata_url(),
+            headers=headers,
+            timeout=current_app.config["OTM_LOOKUP_TIMEOUT"],
+            verify=False
+        )
+    except Exception as e:
+        logging.error(f"OTM metadata exception: {str(e)}")
+        return None
+
+    now = datetime.utcnow()
+
+    if response.status_code == 304 and entry:
+        entry = dict(entry, checked_at=now)
+        changed = False
+
+    elif response.status_code == 200:
+        entry = {
+            "schemas": extract_schemas(response.json()),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": now
+        }
+        changed = True
+
+    else:
+        logging.error(f"OTM metadata fetch failed: {response.status_code}")
+        return None
+
+    try:
+        persist(entry, changed)
+    except Exception:
+        logging.exception("Could not persist OTM item metadata")
+
+    return entry
+
+
+def is_fresh(entry, ttl):
+    return (
+        entry is not None
+        and not _invalidated
+        and datetime.utcnow() - entry["checked_at"] < ttl
+    )
+
+
+def get_entry():
+    global _entry, _retry_at, _invalidated
+
+    config = current_app.config
+    ttl = timedelta(seconds=config["ITEM_METADATA_TTL_SECONDS"])
+
+    entry = _entry
+    if is_fresh(entry, ttl):
+        return entry
+
+    # single-flight: one caller fetches, the others wait and reuse it
+    with _lock:
+        if _entry is None:
+            try:
+                _entry = load_persisted()
+            except Exception:
+                logging.exception("Could not load persisted OTM item metadata")
+
+        if is_fresh(_entry, ttl):
+            return _entry
+
+        # OTM failed recently: serve what we have instead of retrying
+        if _retry_at and datetime.utcnow() < _retry_at:
+            return _entry
+
+        entry = refresh(_entry)
+        if entry is None:
+            _retry_at = datetime.utcnow() + timedelta(seconds=config["ITEM_METADATA_RETRY_SECONDS"])
+            return _entry
+
+        _entry, _retry_at, _invalidated = entry, None, False
+        return _entry
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+def get_item_properties(schema="Item"):
+    """Property names of an item schema ({} when OTM was never reached)"""
+    entry = get_entry()
+    if entry is None:
+        return {}
+    return entry["schemas"].get(schema, {})
+
+
+def invalidate_item_metadata():
+    """Next lookup revalidates with OTM (a 304 keeps the cached schemas)"""
+    global _retry_at, _invalidated
+    with _lock:
+        _invalidated = True
+        _retry_at = None
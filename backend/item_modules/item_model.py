@@ -6,9 +6,13 @@ from sqlalchemy import (
     Column, Integer, DateTime, String, func, 
     UniqueConstraint, Index, Boolean
 )
+from sqlalchemy import JSON
 from sqlalchemy.dialects.postgresql import JSONB
 from database import db
 
+# JSONB on Postgres, plain JSON elsewhere (SQLite in the tests)
+JSONB_OR_JSON = JSON().with_variant(JSONB(), "postgresql")
+
 class Item(db.Model):
     __tablename__ = "items"
 
@@ -19,7 +23,7 @@ class Item(db.Model):
     )
 
     id = Column(Integer, primary_key=True)
-    payload = Column(JSONB, nullable=False) # Stores dynamic UI fields
+    payload = Column(JSONB_OR_JSON, nullable=False) # Stores dynamic UI fields
 
     # Searchable core fields formatted for OTM
     item_gid = Column(String(255), nullable=False, index=True)
@@ -28,7 +32,7 @@ class Item(db.Model):
     domain_name = Column(String(255), nullable=False, index=True)
 
     otm_sync_status = Column(String(20), nullable=False, default="PENDING")
-    otm_error = Column(JSONB)
+    otm_error = Column(JSONB_OR_JSON)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -3,9 +3,19 @@ from flask import Blueprint, request, jsonify
 from item_modules.item_model import FieldConfig, db
 from item_modules.item_service import (
     create_item,
-    get_otm_item_metadata,
     list_items
 )
+from item_modules.item_metadata import get_item_properties, invalidate_item_metadata
+from item_modules.item_import import read_item_rows, import_items
+from item_modules.field_config_service import (
+    upsert_field_configs,
+    add_missing_field_configs
+)
+from item_modules.field_config_cache import (
+    bump_field_config_version,
+    get_field_config_snapshot
+)
+from http_cache import conditional_json
 
 item_bp = Blueprint("item_bp", __name__)
 
@@ -21,24 +31,11 @@ def upload_template_json():
         if not isinstance(data, list):
             return jsonify({"error": "Data must be a list of field configurations"}), 400
 
-        for item in data:
-            key = item.get('key')
-            if not key:
-                continue
-
-            cfg = FieldConfig.query.filter_by(key=key).first()
-            if not cfg:
-                cfg = FieldConfig(key=key)
-                db.session.add(cfg)
-
-            # Map frontend keys to DB columns
-            cfg.label = item.get('label', cfg.label)
-            cfg.display = bool(item.get('display', cfg.display))
-            cfg.mandatory = bool(item.get('mandatory', cfg.mandatory))
-            cfg.default_value = item.get('defaultValue', item.get('default_value', cfg.default_value))
+        counts = upsert_field_configs(data)
 
         db.session.commit()
-        return jsonify({"message": "Active configuration updated successfully!"}), 200
+        bump_field_config_version()
+        return jsonify({"message": "Active configuration updated successfully!", **counts}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -49,44 +46,54 @@ def upload_template_json():
 def sync_fields_from_otm():
     """Pull fresh metadata from OTM."""
     try:
-        otm_data = get_otm_item_metadata()
-        otm_fields = (otm_data.get('components', {}).get('schemas', {})
-                             .get('items', {}).get('properties', {}))
+        # explicit sync: revalidate the cached metadata with OTM first
+        invalidate_item_metadata()
+        otm_fields = get_item_properties('items')
         
         if not otm_fields:
             return jsonify({"error": "No fields found in OTM metadata"}), 404
 
-        new_count = 0
-        for field_key in otm_fields.keys():
-            if field_key in ['links', '_self']: 
-                continue
-                
-            exists = FieldConfig.query.filter_by(key=field_key).first()
-            if not exists:
-                new_cfg = FieldConfig(
-                    key=field_key, 
-                    label="", 
-                    default_value="", 
-                    display=False, 
-                    mandatory=False,
-                    section="core"
-                )
-                db.session.add(new_cfg)
-                new_count += 1
-                
+        counts = add_missing_field_configs(
+            [k for k in otm_fields.keys() if k not in ['links', '_self']]
+        )
+
         db.session.commit()
-        return jsonify({"message": f"Successfully synced {new_count} new fields."}), 200
+        bump_field_config_version()
+        return jsonify({"message": f"Successfully synced {counts['inserted']} new fields.", **counts}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Sync failed: {str(e)}"}), 500
 
-# --- 4. CONFIG & ROOT ---
+# --- 4. BULK IMPORT ---
+
+@item_bp.route("/import", methods=["POST"])
+def bulk_import_items():
+    """Imports a CSV / Excel / JSON-lines file of items and syncs them to OTM."""
+    file = request.files.get("file")
+    if not file:
+        return jsonify({"error": "File missing"}), 400
+
+    try:
+        rows = read_item_rows(file, file.filename)
+    except Exception as e:
+        return jsonify({"error": f"Could not read file: {str(e)}"}), 400
+
+    if not rows:
+        return jsonify({"error": "No items found in file"}), 400
+
+    try:
+        return jsonify(import_items(rows)), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Import failed: {str(e)}"}), 500
+
+# --- 5. CONFIG & ROOT ---
 
 @item_bp.route("/config", methods=["GET"])
 def handle_config():
-    """Fetch the current active configuration."""
-    configs = FieldConfig.query.order_by(FieldConfig.id.asc()).all()
-    return jsonify([c.to_dict() for c in configs]), 200
+    """Fetch the current active configuration (served from the cached snapshot)."""
+    snapshot = get_field_config_snapshot()
+    return conditional_json("items-config", snapshot["etag"], lambda: snapshot["data"])
 
 @item_bp.route("/", methods=["GET", "POST"])
 def handle_root():
@@ -1,60 +1,24 @@
-import requests
 import json
 import logging
 import urllib3
-from requests.auth import HTTPBasicAuth
+from urllib.parse import quote
 from flask import current_app
 from database import db
 from .item_model import Item
-from item_modules.item_model import FieldConfig
+from item_modules.field_config_cache import get_mandatory_fields
+from item_modules.item_metadata import get_item_properties
+
+import otm_client
  
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
  
 # ======================================================
-# 1. FETCH OTM ITEM METADATA (Schema)
-# ======================================================
- 
-def get_otm_item_metadata():
-    try:
-        url = current_app.config["OTM_METADATA_URL"].rstrip("/")
-        if "metadata-catalog" not in url:
-            url = f"{url}/metadata-catalog/items"
- 
-        response = requests.get(
-            url,
-            auth=HTTPBasicAuth(
-                current_app.config["OTM_USERNAME"],
-                current_app.config["OTM_PASSWORD"]
-            ),
-            headers={"Accept": "application/json"},
-            timeout=15,
-            verify=False
-        )
- 
-        if response.status_code == 200:
-            return response.json()
- 
-        logging.error(f"OTM metadata fetch failed: {response.status_code}")
-        return {}
- 
-    except Exception as e:
-        logging.error(f"OTM metadata exception: {str(e)}")
-        return {}
- 
-# ======================================================
-# 2. FILTER PAYLOAD USING OTM SCHEMA (CRITICAL)
+# 1. FILTER PAYLOAD USING OTM SCHEMA (CRITICAL)
 # ======================================================
  
 def filter_otm_payload(payload):
-    metadata = get_otm_item_metadata()
- 
-    valid_fields = (
-        metadata.get("components", {})
-        .get("schemas", {})
-        .get("Item", {})
-        .get("properties", {})
-        .keys()
-    )
+    # cached, see item_metadata.py
+    valid_fields = get_item_properties("Item")
  
     if not valid_fields:
         return payload  # fallback (do not block)
@@ -62,7 +26,7 @@ def filter_otm_payload(payload):
     return {k: v for k, v in payload.items() if k in valid_fields}
  
 # ======================================================
-# 3. POST / UPSERT ITEM INTO OTM (ONLY RELIABLE WAY)
+# 2. POST / UPSERT ITEM INTO OTM (ONLY RELIABLE WAY)
 # ======================================================
  
 def post_to_otm(item_record):
@@ -70,11 +34,6 @@ def post_to_otm(item_record):
     base_url = raw_url.split("/items")[0]
     url = f"{base_url}/items"
  
-    auth = HTTPBasicAuth(
-        current_app.config["OTM_USERNAME"],
-        current_app.config["OTM_PASSWORD"]
-    )
- 
     # ---- MINIMUM SAFE PAYLOAD ----
     otm_payload = {
         "itemGid": item_record.item_gid,
@@ -99,16 +58,16 @@ def post_to_otm(item_record):
     try:
         logging.info(f"Upserting item into OTM: {item_record.item_gid}")
  
-        response = requests.post(
+        response = otm_client.post(
             url,
             params={"upsert": "true"},
             json=otm_payload,
-            auth=auth,
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json"
             },
-            timeout=30,
+            timeout=current_app.config["OTM_TIMEOUT"],
+            idempotent=True,  # upsert, safe to repeat
             verify=False
         )
  
@@ -119,27 +78,128 @@ def post_to_otm(item_record):
         return None
  
 # ======================================================
-# 4. CREATE ITEM (LOCAL + OTM SYNC)
+# 3. CREATE ITEM (LOCAL + OTM SYNC)
 # ======================================================
  
-def create_item(data):
-    # ---- 1. UI MANDATORY FIELD VALIDATION ----
-    configs = FieldConfig.query.filter_by(display=True).all()
-    for cfg in configs:
-        if cfg.mandatory and not data.get(cfg.key):
-            raise ValueError(f"Field '{cfg.label or cfg.key}' is mandatory.")
- 
-    # ---- 2. DOMAIN & XID ----
-    domain = (data.get("domainName") or "INTL").upper().strip()
-    xid = (data.get("itemXid") or "").upper().strip()
+def validate_mandatory(data, mandatory_fields):
+    for key, label in mandatory_fields:
+        if not data.get(key):
+            raise ValueError(f"Field '{label}' is mandatory.")
+
+
+def normalize_item(data):
+    """Core item columns derived from the submitted fields"""
+    domain = str(data.get("domainName") or "INTL").upper().strip()
+    xid = str(data.get("itemXid") or "").upper().strip()
  
     if not xid:
         raise ValueError("itemXid is required.")
  
-    item_gid = f"{domain}.{xid}"
+    return {
+        "item_gid": f"{domain}.{xid}",
+        "item_xid": xid,
+        "item_name": data.get("itemName") or xid,
+        "domain_name": domain,
+        "payload": data
+    }
+
+
+def verify_in_otm(item_gid):
+    """True when OTM returns the item (do not trust the upsert status)"""
+    verify_url = (
+        current_app.config["OTM_ITEM_URL"].rstrip("/") +
+        f"/{item_gid}"
+    )
+ 
+    verify = otm_client.get(
+        verify_url,
+        headers={"Accept": "application/json"},
+        timeout=current_app.config["OTM_LOOKUP_TIMEOUT"],
+        verify=False
+    )
+ 
+    return verify.status_code == 200
+
+
+def item_exists_in_otm(item_gid):
+    """verify_in_otm for the batch path: raises unless OTM answers 200 / 404"""
+    response = otm_client.get(
+        current_app.config["OTM_ITEM_URL"].rstrip("/") + "/" + quote(item_gid, safe=""),
+        headers={"Accept": "application/json"},
+        timeout=current_app.config["OTM_LOOKUP_TIMEOUT"],
+        verify=False
+    )
+
+    if response.status_code not in (200, 404):
+        raise RuntimeError(f"OTM item lookup failed: {response.status_code}")
+    return response.status_code == 200
+
+
+def verify_items_in_otm(item_gids):
+    """
+    Set of the given GIDs that OTM returns, one q=itemGid in (...) query
+    per ITEM_VERIFY_CHUNK GIDs. Raises when OTM cannot be queried, so the
+    items stay unverified instead of being marked FAILED.
+
+    A GID with a quote or backslash cannot be written as a q literal; it
+    is looked up by its own URL instead.
+    """
+    url = current_app.config["OTM_ITEM_URL"].rstrip("/")
+    size = current_app.config["ITEM_VERIFY_CHUNK"]
+
+    unquotable = {gid for gid in item_gids if '"' in gid or "\\" in gid}
+    found = {gid for gid in unquotable if item_exists_in_otm(gid)}
+    item_gids = [gid for gid in item_gids if gid not in unquotable]
+ 
+    for i in range(0, len(item_gids), size):
+        chunk = item_gids[i:i + size]
+        q = "itemGid in (" + ",".join(f'"{gid}"' for gid in chunk) + ")"
+ 
+        response = otm_client.get(
+            url,
+            params={"q": q, "fields": "itemGid", "limit": len(chunk)},
+            headers={"Accept": "application/json"},
+            timeout=current_app.config["OTM_LOOKUP_TIMEOUT"],
+            verify=False
+        )
+ 
+        if response.status_code != 200:
+            raise RuntimeError(f"OTM item query failed: {response.status_code}")
+ 
+        found.update(item.get("itemGid") for item in response.json().get("items", []))
+ 
+    return found
+
+
+def mark_verified(item_gids, found):
+    """One UPDATE: SUCCESS for the GIDs OTM returned, FAILED for the rest"""
+    if not item_gids:
+        return
  
-    # ---- 3. NAME HANDLING ----
-    item_name = data.get("itemName") or xid
+    found = [gid for gid in item_gids if gid in found]
+    status = (
+        db.case((Item.item_gid.in_(found), "SUCCESS"), else_="FAILED")
+        if found else "FAILED"
+    )
+ 
+    db.session.execute(
+        db.update(Item)
+        .where(Item.item_gid.in_(item_gids))
+        .values(otm_sync_status=status, updated_at=db.func.now())
+    )
+
+
+def batch_verification():
+    return current_app.config.get("ITEM_VERIFY_MODE", "batch") == "batch"
+
+
+def create_item(data):
+    # ---- 1. UI MANDATORY FIELD VALIDATION (CACHED CONFIG) ----
+    validate_mandatory(data, get_mandatory_fields())
+ 
+    # ---- 2. DOMAIN & XID / 3. NAME HANDLING ----
+    fields = normalize_item(data)
+    item_gid = fields["item_gid"]
  
     # ---- 4. UPSERT LOCAL DB ----
     item = Item.query.filter_by(item_gid=item_gid).first()
@@ -147,9 +207,9 @@ def create_item(data):
         item = Item(item_gid=item_gid)
         db.session.add(item)
  
-    item.item_xid = xid
-    item.item_name = item_name
-    item.domain_name = domain
+    item.item_xid = fields["item_xid"]
+    item.item_name = fields["item_name"]
+    item.domain_name = fields["domain_name"]
     item.payload = data
     item.otm_sync_status = "PENDING"
  
@@ -160,23 +220,10 @@ def create_item(data):
  
     # ---- 6. VERIFY OTM PERSISTENCE (DO NOT TRUST STATUS) ----
     if response and response.status_code in [200, 201, 204]:
-        verify_url = (
-            current_app.config["OTM_ITEM_URL"].rstrip("/") +
-            f"/{item.item_gid}"
-        )
- 
-        verify = requests.get(
-            verify_url,
-            auth=HTTPBasicAuth(
-                current_app.config["OTM_USERNAME"],
-                current_app.config["OTM_PASSWORD"]
-            ),
-            headers={"Accept": "application/json"},
-            timeout=15,
-            verify=False
-        )
- 
-        if verify.status_code == 200:
+        if batch_verification():
+            # confirmed later in bulk by item_verifier.py
+            item.otm_sync_status = "VERIFYING"
+        elif verify_in_otm(item.item_gid):
             item.otm_sync_status = "SUCCESS"
         else:
             item.otm_sync_status = "FAILED"
@@ -191,7 +238,7 @@ def create_item(data):
     return item
  
 # ======================================================
-# 5. HELPERS
+# 4. HELPERS
 # ======================================================
  
 def get_item(item_id):
@@ -214,14 +261,10 @@ def get_otm_reference_data(resource_path, field_name):
         base_url = raw_url.split("/metadata-catalog")[0]
         url = f"{base_url}/{resource_path}"
  
-        response = requests.get(
+        response = otm_client.get(
             url,
-            auth=HTTPBasicAuth(
-                current_app.config["OTM_USERNAME"],
-                current_app.config["OTM_PASSWORD"]
-            ),
             params={"limit": 100},
-            timeout=15,
+            timeout=current_app.config["OTM_LOOKUP_TIMEOUT"],
             verify=False
         )
  
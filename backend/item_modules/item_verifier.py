@@ -0,0 +1,96 @@
+"""
+Background confirmation of items OTM accepted but has not yet verified.
+
+With ITEM_VERIFY_MODE = "batch", create_item leaves an accepted upsert in
+otm_sync_status VERIFYING instead of issuing one GET /items/{gid} per
+item. This worker collects them and confirms them in bulk: one OTM
+query per ITEM_VERIFY_CHUNK GIDs, one UPDATE for the whole batch.
+
+Run standalone with:
+    python -m item_modules.item_verifier
+"""
+import logging
+import threading
+import time
+
+from database import db
+from .item_model import Item
+from .item_service import verify_items_in_otm, mark_verified
+
+
+# ============================================================
+# ONE VERIFICATION CYCLE
+# ============================================================
+def verify_pending(limit):
+    """Verifies up to limit VERIFYING items; returns how many were checked"""
+
+    stmt = (
+        db.select(Item.item_gid)
+        .where(Item.otm_sync_status == "VERIFYING")
+        .order_by(Item.updated_at, Item.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    gids = db.session.execute(stmt).scalars().all()
+
+    if not gids:
+        db.session.rollback()
+        return 0
+
+    try:
+        found = verify_items_in_otm(gids)
+    except Exception:
+        # OTM unreachable: the items stay VERIFYING for the next cycle
+        logging.exception("Item verification failed")
+        db.session.rollback()
+        return 0
+
+    mark_verified(gids, found)
+    db.session.commit()
+    return len(gids)
+
+
+# ============================================================
+# VERIFIER LOOP
+# ============================================================
+def verifier_loop(app):
+    batch_size = app.config["ITEM_VERIFY_BATCH_SIZE"]
+    poll_seconds = app.config["ITEM_VERIFY_POLL_SECONDS"]
+
+    while True:
+        checked = 0
+        with app.app_context():
+            try:
+                checked = verify_pending(batch_size)
+            except Exception:
+                logging.exception("Item verifier error")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+        # keep going while full batches come back
+        if checked < batch_size:
+            time.sleep(poll_seconds)
+
+
+def start_item_verifier(app):
+    if app.config.get("ITEM_VERIFY_MODE", "batch") != "batch":
+        return None
+
+    t = threading.Thread(
+        target=verifier_loop,
+        args=(app,),
+        name="otm-item-verifier",
+        daemon=True
+    )
+    t.start()
+    return t
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO)
+    print("🔎 OTM item verifier started")
+    verifier_loop(app)
@@ -1,15 +1,22 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from uuid import uuid4
 
+from xml_builder import resolve_column, column_values
+
 
 def build_invoice_json_from_excel(excel_file, field_mapping=None):
     df = pd.read_excel(excel_file)
+    print("📊 EXCEL/DF COLUMNS:", df.columns.tolist())
     return build_invoice_json_from_dataframe(df, field_mapping)
 
 
-def build_invoice_json_from_dataframe(df, field_mapping=None):
-    print("📊 EXCEL/DF COLUMNS:", df.columns.tolist())
+def build_invoice_json_from_dataframe_rowwise(df, field_mapping=None):
+    """
+    Original row-by-row builder. Kept as the reference output for
+    build_invoice_json_from_dataframe and for bench_json_builder.py.
+    """
 
     header = df.iloc[0]
     now = datetime.utcnow().isoformat()
@@ -83,3 +90,105 @@ def build_invoice_json_from_dataframe(df, field_mapping=None):
         })
 
     return payload
+
+
+# ============================================================
+# COLUMNAR LINE ITEMS
+# ============================================================
+def line_amount(val):
+    """float() rule of the row loop for one value"""
+    try:
+        return float(val) if val and str(val).strip() else 0.0
+    except ValueError:
+        return 0.0
+
+
+def parse_line_amounts(values, length):
+    """line_amount() for a whole column"""
+    if values is None:
+        return [0.0] * length
+
+    if values.dtype.kind in "biuf":
+        # + 0.0 turns -0.0 (falsy, so 0.0 in the row loop) into 0.0
+        return (values.astype(float) + 0.0).tolist()
+
+    amounts = pd.to_numeric(values, errors="coerce").astype(float)
+
+    # None, "", bad text and zeros (0 vs "-0") follow the row rule;
+    # a real NaN cell stays NaN, as float(nan) did
+    is_nan_cell = np.array([isinstance(v, float) and v != v for v in values])
+    recheck = np.flatnonzero(((amounts != amounts) & ~is_nan_cell) | (amounts == 0))
+    for i in recheck.tolist():
+        amounts[i] = line_amount(values[i])
+
+    return amounts.tolist()
+
+
+def build_invoice_json_from_dataframe(df, field_mapping=None):
+    header = df.iloc[0]
+    now = datetime.utcnow().isoformat()
+
+    # Helper to get value based on mapping or default
+    def get_val(field_id, default_col):
+        col_name = resolve_column(df, field_mapping, field_id, default_col)
+        val = header.get(col_name) if col_name else None
+        if isinstance(val, list):
+            return val
+        return str(val) if val is not None else None
+
+    payload = {
+        "domainName": "INTL",
+        "invoiceXid": f"{get_val('invoiceXid', 'INVOICE_XID')}_{uuid4().hex[:6]}",
+        "invoiceNumber": get_val('invoiceNumber', 'INVOICE_NUM'),
+        "invoiceType": "STANDARD",
+        "invoiceSource": "MANUAL",
+        "servprovAliasQualGid": "GLOG",
+        "servprovAliasValue": get_val('serviceProvider', 'SERVICE_PROVIDER'),
+        "currencyGid": get_val('currencyGid', 'CURRENCY') or "INR",
+        "invoiceDate": {"value": now, "timezone": "UTC"},
+        "dateReceived": {"value": now, "timezone": "UTC"},
+        "refnums": {
+            "items": [
+                {
+                    "invoiceRefnumQualGid": "BM",
+                    "invoiceRefnumValue": get_val('invoiceNumber', 'INVOICE_NUM'),
+                    "domainName": "INTL"
+                }
+            ]
+        },
+        "lineItems": {"items": []}
+    }
+
+    # ---------- COLUMN PLAN (resolved once) ----------
+    # values in the row dtype iterrows() used, so the JSON types match
+    n = len(df)
+    dtype = df.iloc[:1].to_numpy().dtype
+
+    amount_col = resolve_column(df, field_mapping, 'amount', 'AMOUNT')
+    amounts = parse_line_amounts(column_values(df, amount_col, dtype), n)
+
+    cost_col = resolve_column(df, field_mapping, 'costTypeGid', 'COST_TYPE')
+    cost_values = column_values(df, cost_col, dtype)
+    cost_types = [None] * n if cost_values is None else cost_values.tolist()
+
+    currency = payload["currencyGid"]
+
+    payload["lineItems"]["items"] = [
+        {
+            "lineitemSeqNo": seq_no,
+            "description": "",
+            "freightCharge": {
+                "value": amount,
+                "currency": currency
+            },
+            "processAsFlowThru": False,
+            "costTypeGid": cost_type or "GENERIC",
+            "domainName": "INTL",
+            "costRefs": {
+                "items": [{"shipmentCostQualGid": "SHIPMENT_COST", "domainName": "INTL"}]
+            }
+        }
+        for seq_no, amount, cost_type in zip((df.index + 1).tolist(), amounts, cost_types)
+    ]
+
+    return payload
@@ -0,0 +1,79 @@
+"""
+orjson-backed JSON provider for the Flask app (app.json).
+
+Produces the same documents as Flask's default provider for what this app
+sends: key order is kept (sort_keys = False, OTM field order), dates are
+still HTTP dates and anything else orjson does not know (Decimal, ...)
+goes through the same default(). NumPy scalars and arrays (DataFrame
+values) are serialized as their Python equivalents. Differences: non-ASCII
+text is sent as UTF-8 rather than \\u escapes, and NaN / Infinity become
+null.
+"""
+import numpy as np
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        # whatever OPT_SERIALIZE_NUMPY leaves over (object arrays, float16,
+        # ...), and NumPy values on the json module fallback
+        if isinstance(o, np.generic):
+            return o.item()
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        return DefaultJSONProvider.default(o)
+
+    def options(self, indent=False):
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_SERIALIZE_NUMPY
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # anything beyond Flask's own formatting args uses the json module
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+
+        option = self.options(indent=kwargs.get("indent") is not None)
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity literals, accepted by the json module
+            return super().loads(s)
+
+    def response(self, *args, **kwargs):
+        """Same as DefaultJSONProvider.response, without the str round trip"""
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+
+        if not args and not kwargs:
+            obj = None
+        elif len(args) == 1:
+            obj = args[0]
+        else:
+            obj = args or kwargs
+
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self.options(indent=indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,185 @@
+"""
+OTM metadata-catalog → OtmObjectMetadata / MetadataField.
+
+Used by POST /api/metadata/sync/<object_name> for one object and by
+POST /api/metadata/sync-all for the whole otm_catalog.json. Sync-all
+fetches the objects on a bounded pool (METADATA_SYNC_WORKERS) and writes
+every successful one in a single transaction.
+
+Each object stores a content hash of its fields: an unchanged object
+only gets a new last_synced, a changed one gets just the rows that
+were added, removed or modified (existing field ids are kept).
+
+Run a full sync from the command line with:
+    python metadata_sync.py
+"""
+import hashlib
+import json
+import time
+
+from flask import current_app
+
+from database import db
+from models import OtmObjectMetadata, MetadataField
+from catalog_service import load_otm_catalog, get_classification_from_catalog
+from otm_rest_service import get_otm_metadata
+from task_pool import map_in_order
+
+
+# ============================================================
+# STORE ONE OBJECT (NO COMMIT)
+# ============================================================
+def extract_fields(data):
+    """{field_name: (data_type, is_required)} from a metadata-catalog response"""
+    # The structure of OTM metadata-catalog Usually has "attributes" or "properties"
+    # We will simple extract top-level names for now
+    return {
+        item["name"]: (item.get("type"), not item.get("nullable", True))
+        for item in data.get("attributes", [])
+        if item.get("name")
+    }
+
+
+def fields_hash(fields):
+    canonical = json.dumps(sorted(fields.items()), separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def store_object_metadata(object_name, data, metadata=None):
+    """
+    Brings the stored fields of object_name in line with data. Nothing but
+    last_synced is written when the content hash is unchanged; otherwise
+    only the added / removed / modified rows are. Returns the summary.
+    """
+    fields = extract_fields(data)
+    content_hash = fields_hash(fields)
+
+    # Check classification from catalog
+    classification = get_classification_from_catalog(object_name)
+
+    # Update or create Header
+    if metadata is None:
+        metadata = OtmObjectMetadata.query.filter_by(object_name=object_name).first()
+    if not metadata:
+        metadata = OtmObjectMetadata(object_name=object_name, classification=classification)
+        db.session.add(metadata)
+    else:
+        metadata.classification = classification
+        metadata.last_synced = db.func.now()
+
+    summary = {
+        "fields_count": len(fields),
+        "unchanged": metadata.content_hash == content_hash,
+        "diff": {"added": [], "removed": [], "modified": []}
+    }
+
+    if summary["unchanged"]:
+        return summary
+
+    metadata.content_hash = content_hash
+    diff = summary["diff"]
+
+    stored = {}
+    if metadata.id is not None:
+        for field in MetadataField.query.filter_by(metadata_id=metadata.id):
+            if field.field_name not in fields:
+                db.session.delete(field)
+                diff["removed"].append(field.field_name)
+            elif field.field_name in stored:
+                # duplicate left by the old delete/re-insert sync
+                db.session.delete(field)
+            else:
+                stored[field.field_name] = field
+
+    for name, (data_type, is_required) in fields.items():
+        field = stored.get(name)
+
+        if field is None:
+            db.session.add(MetadataField(
+                object_metadata=metadata,
+                field_name=name,
+                data_type=data_type,
+                is_required=is_required
+            ))
+            diff["added"].append(name)
+
+        elif (field.data_type, bool(field.is_required)) != (data_type, is_required):
+            field.data_type = data_type
+            field.is_required = is_required
+            diff["modified"].append(name)
+
+    return summary
+
+
+# ============================================================
+# SYNC ALL CATALOG OBJECTS
+# ============================================================
+def catalog_object_names():
+    return [
+        item["name"]
+        for items in load_otm_catalog().values()
+        for item in items
+    ]
+
+
+def fetch_metadata(object_name):
+    """(status_code, data, seconds); runs on the pool, no DB access"""
+    started = time.perf_counter()
+    status_code, data = get_otm_metadata(object_name)
+    return status_code, data, time.perf_counter() - started
+
+
+def sync_all_metadata(object_names=None):
+    """Fetches in parallel, writes in one transaction; the caller commits"""
+    started = time.perf_counter()
+    names = list(dict.fromkeys(object_names or catalog_object_names()))
+
+    existing = {
+        m.object_name: m
+        for m in OtmObjectMetadata.query.filter(OtmObjectMetadata.object_name.in_(names))
+    }
+
+    fetches = map_in_order(
+        fetch_metadata,
+        names,
+        max_workers=current_app.config.get("METADATA_SYNC_WORKERS", 8)
+    )
+
+    results = []
+    for name, outcome, ex in fetches:
+        if ex is not None:
+            results.append({"object": name, "status": "FAILED", "error": str(ex)})
+            continue
+
+        status_code, data, seconds = outcome
+        result = {"object": name, "fetch_seconds": round(seconds, 3)}
+
+        if status_code != 200:
+            result.update(status="FAILED", http_status=status_code, error=data.get("error"))
+        else:
+            result.update(
+                status="SYNCED",
+                classification=get_classification_from_catalog(name),
+                **store_object_metadata(name, data, existing.get(name))
+            )
+
+        results.append(result)
+
+    synced = sum(1 for r in results if r["status"] == "SYNCED")
+
+    return {
+        "message": f"Synced {synced} of {len(names)} objects",
+        "synced": synced,
+        "failed": len(names) - synced,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "objects": results
+    }
+
+
+if __name__ == "__main__":
+    from app import app
+
+    with app.app_context():
+        summary = sync_all_metadata()
+        db.session.commit()
+        print(json.dumps(summary, indent=2))
@@ -0,0 +1,57 @@
+"""move the item metadata cache to otm_metadata_cache
+
+Revision ID: 2c7e9b4f1a63
+Revises: 6f3b8a1d5e27
+Create Date: 2026-10-18 18:41:19.604257
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c7e9b4f1a63'
+down_revision = '6f3b8a1d5e27'
+branch_labels = None
+depends_on = None
+
+# OtmObjectMetadata row the cache used to live in
+CACHE_OBJECT_NAME = 'item_metadata_catalog'
+
+header = sa.table('otm_object_metadata',
+    sa.column('id', sa.Integer),
+    sa.column('object_name', sa.String),
+)
+
+fields = sa.table('metadata_fields',
+    sa.column('metadata_id', sa.Integer),
+)
+
+
+def upgrade():
+    op.create_table('otm_metadata_cache',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('etag', sa.String(length=255), nullable=True),
+    sa.Column('last_modified', sa.String(length=64), nullable=True),
+    sa.Column('schemas', sa.JSON(), nullable=False),
+    sa.Column('checked_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # the old cache row is dropped, not copied: the next lookup downloads
+    # the catalog once and fills otm_metadata_cache
+    cache_ids = sa.select(header.c.id).where(header.c.object_name == CACHE_OBJECT_NAME)
+    op.execute(fields.delete().where(fields.c.metadata_id.in_(cache_ids)))
+    op.execute(header.delete().where(header.c.object_name == CACHE_OBJECT_NAME))
+
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
+
+
+def downgrade():
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('etag', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('last_modified', sa.String(length=64), nullable=True))
+
+    op.drop_table('otm_metadata_cache')
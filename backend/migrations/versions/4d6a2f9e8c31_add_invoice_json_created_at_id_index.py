@@ -0,0 +1,26 @@
+"""add invoice_json (created_at, id) index
+
+Revision ID: 4d6a2f9e8c31
+Revises: 9b4e7d2c0a16
+Create Date: 2026-10-18 16:22:05.771903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d6a2f9e8c31'
+down_revision = '9b4e7d2c0a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoice_json', schema=None) as batch_op:
+        batch_op.create_index('ix_invoice_json_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoice_json', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoice_json_created_at_id')
@@ -0,0 +1,26 @@
+"""add upload_jobs.template_id
+
+Revision ID: 6f3b8a1d5e27
+Revises: 4d6a2f9e8c31
+Create Date: 2026-10-18 18:05:42.318604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3b8a1d5e27'
+down_revision = '4d6a2f9e8c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('template_id', sa.Uuid(as_uuid=False), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.drop_column('template_id')
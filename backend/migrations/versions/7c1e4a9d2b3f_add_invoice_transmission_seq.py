@@ -0,0 +1,26 @@
+"""add invoice transmission_seq
+
+Revision ID: 7c1e4a9d2b3f
+Revises: 59ff338bf471, 3fb124d584b4
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9d2b3f'
+down_revision = ('59ff338bf471', '3fb124d584b4')
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('transmission_seq', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.drop_column('transmission_seq')
@@ -0,0 +1,178 @@
+"""move invoice payloads to payload_archive
+
+Revision ID: 9b4e7d2c0a16
+Revises: c8e1b5f2a047
+Create Date: 2026-10-18 15:41:07.204815
+
+"""
+import gzip
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4e7d2c0a16'
+down_revision = 'c8e1b5f2a047'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# kept in step with payload_store.py at the time of writing
+PAYLOADS = [
+    ('request_xml', 'xml', sa.Text),
+    ('response_xml', 'xml', sa.Text),
+    ('request_json', 'json', sa.JSON),
+    ('response_json', 'json', sa.JSON),
+]
+
+archive = sa.table('payload_archive',
+    sa.column('hash', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('size', sa.Integer),
+    sa.column('body', sa.LargeBinary),
+)
+
+invoices = sa.table('invoices',
+    sa.column('id', sa.Integer),
+    *[sa.column(name, type_) for name, _, type_ in PAYLOADS],
+    *[sa.column(f'{name}_hash', sa.String) for name, _, _ in PAYLOADS],
+)
+
+
+def encode(kind, value):
+    if kind == 'json':
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return value.encode('utf-8')
+
+
+def decode(kind, data):
+    text = data.decode('utf-8')
+    return json.loads(text) if kind == 'json' else text
+
+
+def batches(bind, columns):
+    """Invoices in id order, BATCH_SIZE rows at a time"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(invoices.c.id, *columns)
+            .where(invoices.c.id > last_id)
+            .order_by(invoices.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def upgrade():
+    op.create_table('payload_archive',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('codec', sa.String(length=10), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('hash')
+    )
+
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        for name, _, _ in PAYLOADS:
+            batch_op.add_column(sa.Column(f'{name}_hash', sa.String(length=64), nullable=True))
+
+    # backfill: archive each distinct body once, point the rows at it
+    bind = op.get_bind()
+    columns = [invoices.c[name] for name, _, _ in PAYLOADS]
+
+    for rows in batches(bind, columns):
+        bodies = {}
+        updates = []
+
+        for row in rows:
+            update = {'b_id': row.id}
+            for name, kind, _ in PAYLOADS:
+                value = getattr(row, name)
+                if value is None:
+                    update[f'{name}_hash'] = None
+                    continue
+
+                data = encode(kind, value)
+                digest = hashlib.sha256(data).hexdigest()
+                bodies.setdefault(digest, {
+                    'hash': digest,
+                    'codec': 'gzip',
+                    'size': len(data),
+                    'body': gzip.compress(data, compresslevel=6, mtime=0)
+                })
+                update[f'{name}_hash'] = digest
+            updates.append(update)
+
+        if bodies:
+            bind.execute(
+                pg_insert(archive).on_conflict_do_nothing(index_elements=['hash']),
+                list(bodies.values())
+            )
+
+        bind.execute(
+            invoices.update()
+            .where(invoices.c.id == sa.bindparam('b_id'))
+            .values({
+                f'{name}_hash': sa.bindparam(f'{name}_hash')
+                for name, _, _ in PAYLOADS
+            }),
+            updates
+        )
+
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        for name, _, _ in PAYLOADS:
+            batch_op.drop_column(name)
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        for name, _, type_ in PAYLOADS:
+            batch_op.add_column(sa.Column(name, type_(), nullable=True))
+
+    bind = op.get_bind()
+    hash_columns = [invoices.c[f'{name}_hash'] for name, _, _ in PAYLOADS]
+
+    for rows in batches(bind, hash_columns):
+        digests = {
+            getattr(row, f'{name}_hash')
+            for row in rows
+            for name, _, _ in PAYLOADS
+        } - {None}
+
+        stored = {
+            r.hash: gzip.decompress(r.body)
+            for r in bind.execute(
+                sa.select(archive.c.hash, archive.c.body)
+                .where(archive.c.hash.in_(digests))
+            )
+        } if digests else {}
+
+        updates = []
+        for row in rows:
+            update = {'b_id': row.id}
+            for name, kind, _ in PAYLOADS:
+                data = stored.get(getattr(row, f'{name}_hash'))
+                update[name] = None if data is None else decode(kind, data)
+            updates.append(update)
+
+        bind.execute(
+            invoices.update()
+            .where(invoices.c.id == sa.bindparam('b_id'))
+            .values({name: sa.bindparam(name) for name, _, _ in PAYLOADS}),
+            updates
+        )
+
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        for name, _, _ in PAYLOADS:
+            batch_op.drop_column(f'{name}_hash')
+
+    op.drop_table('payload_archive')
@@ -0,0 +1,66 @@
+"""add templates table, import invoice_templates.json
+
+Revision ID: a3f9d0c71e58
+Revises: f2a8c6d4b913
+Create Date: 2026-10-18 14:18:52.640117
+
+"""
+import json
+import os
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f9d0c71e58'
+down_revision = 'f2a8c6d4b913'
+branch_labels = None
+depends_on = None
+
+TEMPLATES_FILE = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'invoice_templates.json'
+)
+
+
+def upgrade():
+    templates = op.create_table('templates',
+    sa.Column('id', sa.Uuid(as_uuid=False), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('fields', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('templates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_templates_created_at'), ['created_at'], unique=False)
+
+    # one-shot import of the file-based store, keeping ids and order
+    if not os.path.exists(TEMPLATES_FILE):
+        return
+
+    with open(TEMPLATES_FILE, 'r') as f:
+        existing = json.load(f)
+
+    now = datetime.utcnow()
+    op.bulk_insert(templates, [
+        {
+            'id': t['id'],
+            'name': t['name'],
+            'fields': t.get('fields', []),
+            'version': 1,
+            # microsecond steps keep the file order for ORDER BY created_at
+            'created_at': now.replace(microsecond=i),
+            'updated_at': now
+        }
+        for i, t in enumerate(existing)
+    ])
+
+
+def downgrade():
+    with op.batch_alter_table('templates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_templates_created_at'))
+
+    op.drop_table('templates')
@@ -0,0 +1,45 @@
+"""add upload_jobs table
+
+Revision ID: b4d2f81c6e07
+Revises: 7c1e4a9d2b3f
+Create Date: 2026-10-18 11:02:17.583920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d2f81c6e07'
+down_revision = '7c1e4a9d2b3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upload_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('process_type', sa.String(length=10), nullable=False),
+    sa.Column('streaming', sa.Boolean(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('file_data', sa.LargeBinary(), nullable=True),
+    sa.Column('invoices_done', sa.Integer(), nullable=True),
+    sa.Column('invoices_failed', sa.Integer(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_upload_jobs_status_id', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_upload_jobs_status_id')
+
+    op.drop_table('upload_jobs')
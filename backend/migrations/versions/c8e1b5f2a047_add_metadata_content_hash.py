@@ -0,0 +1,26 @@
+"""add content_hash to otm_object_metadata
+
+Revision ID: c8e1b5f2a047
+Revises: a3f9d0c71e58
+Create Date: 2026-10-18 15:06:33.918274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e1b5f2a047'
+down_revision = 'a3f9d0c71e58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
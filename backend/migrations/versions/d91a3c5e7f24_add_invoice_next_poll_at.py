@@ -0,0 +1,28 @@
+"""add invoice next_poll_at
+
+Revision ID: d91a3c5e7f24
+Revises: b4d2f81c6e07
+Create Date: 2026-10-18 12:20:05.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91a3c5e7f24'
+down_revision = 'b4d2f81c6e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_poll_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_invoices_next_poll_at'), ['next_poll_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_invoices_next_poll_at'))
+        batch_op.drop_column('next_poll_at')
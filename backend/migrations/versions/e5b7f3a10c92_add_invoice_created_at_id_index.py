@@ -0,0 +1,26 @@
+"""add invoice (created_at, id) index
+
+Revision ID: e5b7f3a10c92
+Revises: d91a3c5e7f24
+Create Date: 2026-10-18 13:02:41.507213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7f3a10c92'
+down_revision = 'd91a3c5e7f24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.create_index('ix_invoices_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoices_created_at_id')
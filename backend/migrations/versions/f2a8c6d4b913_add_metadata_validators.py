@@ -0,0 +1,28 @@
+"""add etag / last_modified to otm_object_metadata
+
+Revision ID: f2a8c6d4b913
+Revises: e5b7f3a10c92
+Create Date: 2026-10-18 13:41:09.226305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8c6d4b913'
+down_revision = 'e5b7f3a10c92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('etag', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('last_modified', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('otm_object_metadata', schema=None) as batch_op:
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
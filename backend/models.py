@@ -1,4 +1,5 @@
 from database import db
+from payload_store import ArchivedPayload
 import datetime
 from datetime import datetime
 
@@ -32,11 +33,23 @@ class Invoice(db.Model):
 
     transmission_no = db.Column(db.String(50))
 
-    request_xml = db.Column(db.Text)
-    response_xml = db.Column(db.Text)
+    # 1-based position inside a packed transmission (several invoices
+    # sent as one Transmission); NULL when the invoice was sent alone
+    transmission_seq = db.Column(db.Integer)
 
-    request_json = db.Column(db.JSON)
-    response_json = db.Column(db.JSON)
+    # payload bodies live in payload_archive (payload_store.py), the
+    # row only keeps their sha256; the bodies are loaded on first access
+    request_xml_hash = db.Column(db.String(64))
+    response_xml_hash = db.Column(db.String(64))
+
+    request_json_hash = db.Column(db.String(64))
+    response_json_hash = db.Column(db.String(64))
+
+    request_xml = ArchivedPayload("xml")
+    response_xml = ArchivedPayload("xml")
+
+    request_json = ArchivedPayload("json")
+    response_json = ArchivedPayload("json")
 
     error_message = db.Column(db.Text)
 
@@ -48,6 +61,27 @@ class Invoice(db.Model):
 
     created_at = db.Column(db.DateTime, default=db.func.now())
 
+    # when status_poller.py should next check this invoice with OTM
+    next_poll_at = db.Column(db.DateTime, index=True)
+
+    __table_args__ = (
+        # keyset pagination of GET /api/invoices
+        db.Index("ix_invoices_created_at_id", "created_at", "id"),
+    )
+
+
+class PayloadArchive(db.Model):
+    """Compressed invoice payload body, one row per distinct content"""
+    __tablename__ = "payload_archive"
+
+    hash = db.Column(db.String(64), primary_key=True)  # sha256 of the text
+    codec = db.Column(db.String(10), nullable=False)   # gzip
+    size = db.Column(db.Integer, nullable=False)       # uncompressed bytes
+    body = db.Column(db.LargeBinary, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=db.func.now())
+
+
 class InvoiceFieldConfig(db.Model):
     __tablename__ = "invoice_field_config"
 
@@ -83,6 +117,11 @@ class InvoiceJson(db.Model):
         default=datetime.utcnow
     )
 
+    __table_args__ = (
+        # keyset pagination of GET /api/invoice/json
+        db.Index("ix_invoice_json_created_at_id", "created_at", "id"),
+    )
+
 
 class OtmObjectMetadata(db.Model):
     __tablename__ = "otm_object_metadata"
@@ -92,6 +131,9 @@ class OtmObjectMetadata(db.Model):
     classification = db.Column(db.String(20), nullable=False)  # MASTER / TRANSACTION / POWER
     last_synced = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # sha256 of the stored fields; an unchanged sync skips the field rows
+    content_hash = db.Column(db.String(64))
+
     fields = db.relationship('MetadataField', backref='object_metadata', lazy=True, cascade="all, delete-orphan")
 
 
@@ -104,3 +146,79 @@ class MetadataField(db.Model):
     path = db.Column(db.String(255))
     data_type = db.Column(db.String(50))
     is_required = db.Column(db.Boolean, default=False)
+
+
+class OtmMetadataCache(db.Model):
+    """
+    Last metadata-catalog download, kept for conditional revalidation
+    (item_modules/item_metadata.py); not a catalog object
+    """
+    __tablename__ = "otm_metadata_cache"
+
+    name = db.Column(db.String(100), primary_key=True)
+
+    # HTTP validators of the download
+    etag = db.Column(db.String(255))
+    last_modified = db.Column(db.String(64))
+
+    # {schema: {field: [data_type, is_required]}}
+    schemas = db.Column(db.JSON, nullable=False)
+    checked_at = db.Column(db.DateTime)
+
+
+class UploadJob(db.Model):
+    """Excel upload queued for the background workers (upload_jobs.py)"""
+    __tablename__ = "upload_jobs"
+    __table_args__ = (
+        db.Index("ix_upload_jobs_status_id", "status", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # QUEUED -> RUNNING -> DONE | FAILED
+    status = db.Column(db.String(20), nullable=False, default="QUEUED")
+
+    process_type = db.Column(db.String(10), nullable=False)  # xml | json
+    streaming = db.Column(db.Boolean, default=False)
+    template_id = db.Column(db.Uuid(as_uuid=False))  # column mapping, optional
+
+    filename = db.Column(db.String(255))
+    file_data = db.Column(db.LargeBinary)  # cleared once the job is done
+
+    invoices_done = db.Column(db.Integer, default=0)
+    invoices_failed = db.Column(db.Integer, default=0)
+
+    result = db.Column(db.JSON)
+    error_message = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+
+class InvoiceTemplate(db.Model):
+    """Saved invoice upload template (formerly invoice_templates.json)"""
+    __tablename__ = "templates"
+
+    id = db.Column(db.Uuid(as_uuid=False), primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+
+    # [{id, name, displayText, defaultValue, display, mandatory}, ...]
+    fields = db.Column(db.JSON, nullable=False)
+
+    # bumped on every UPDATE; concurrent writers get StaleDataError
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __mapper_args__ = {"version_id_col": version}
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "fields": self.fields,
+            "version": self.version
+        }
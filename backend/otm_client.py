@@ -0,0 +1,132 @@
+"""
+Shared HTTP client for every outbound OTM call.
+
+One requests.Session per process keeps TLS connections alive in a sized
+pool instead of opening a new connection (and handshake) per call.
+Timeouts, credentials and retries are configured here, in one place.
+
+Idempotent calls (GET/HEAD/PUT/DELETE/OPTIONS, or any call made with
+idempotent=True such as DBXML read queries) are retried on connection
+errors and 429/502/503/504 with jittered exponential backoff. Plain
+POSTs are sent once, since OTM may already have accepted them.
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+# ============================================================
+# SESSION (ONE PER PROCESS)
+# ============================================================
+def get_session():
+    global _session, _session_pid
+
+    # a forked worker must not share the parent's sockets
+    if _session is not None and _session_pid == os.getpid():
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            session.auth = (Config.OTM_USERNAME, Config.OTM_PASSWORD)
+
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=Config.OTM_POOL_SIZE,
+                max_retries=0  # retries are handled in request()
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _session = session
+            _session_pid = os.getpid()
+
+    return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# ============================================================
+# RETRY POLICY
+# ============================================================
+def backoff_delay(attempt, response=None):
+    """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+    cap = Config.OTM_RETRY_MAX_DELAY
+
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), cap)
+
+    return random.uniform(0, min(cap, Config.OTM_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# ============================================================
+# REQUESTS
+# ============================================================
+def request(method, url, timeout=None, idempotent=None, **kwargs):
+    """
+    Same arguments as requests.request(). timeout is the read timeout in
+    seconds (Config.OTM_TIMEOUT by default); the connect timeout always
+    comes from Config.OTM_CONNECT_TIMEOUT.
+    """
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    attempts = 1 + (Config.OTM_RETRIES if idempotent else 0)
+    timeout = (Config.OTM_CONNECT_TIMEOUT, timeout or Config.OTM_TIMEOUT)
+    session = get_session()
+
+    for attempt in range(attempts):
+        last_try = attempt == attempts - 1
+
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if last_try:
+                raise
+            delay = backoff_delay(attempt)
+            logging.warning(f"OTM {method} {url} failed ({e}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUSES and not last_try:
+            delay = backoff_delay(attempt, response)
+            logging.warning(f"OTM {method} {url} returned {response.status_code}; retrying in {delay:.2f}s")
+            response.close()
+            time.sleep(delay)
+            continue
+
+        return response
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
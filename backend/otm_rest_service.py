@@ -1,6 +1,7 @@
-import requests
 from config import Config
 
+import otm_client
+
 
 def post_invoice_json_to_otm(payload):
     """
@@ -18,15 +19,11 @@ def post_invoice_json_to_otm(payload):
         "Accept": "application/json"
     }
 
-    response = requests.post(
+    response = otm_client.post(
         url,
         json=payload,
         headers=headers,
-        auth=(
-            Config.OTM_USERNAME,
-            Config.OTM_PASSWORD
-        ),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     try:
@@ -51,15 +48,11 @@ def post_json_to_otm(payload):
         "Accept": "application/vnd.oracle.resource+json"
     }
 
-    response = requests.post(
+    response = otm_client.post(
         url,
         json=payload,
         headers=headers,
-        auth=(
-            Config.OTM_USERNAME,
-            Config.OTM_PASSWORD
-        ),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     return response
@@ -77,15 +70,11 @@ def post_excel_json_invoice_to_otm(payload):
         "Accept": "application/vnd.oracle.resource+json"
     }
 
-    response = requests.post(
+    response = otm_client.post(
         url,
         json=payload,
         headers=headers,
-        auth=(
-            Config.OTM_USERNAME,
-            Config.OTM_PASSWORD
-        ),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     if response.status_code not in (200, 201):
@@ -107,14 +96,10 @@ def get_otm_metadata(object_name):
         "Accept": "application/json"
     }
 
-    response = requests.get(
+    response = otm_client.get(
         url,
         headers=headers,
-        auth=(
-            Config.OTM_USERNAME,
-            Config.OTM_PASSWORD
-        ),
-        timeout=60
+        timeout=Config.OTM_QUERY_TIMEOUT
     )
 
     if response.status_code != 200:
@@ -1,8 +1,9 @@
-import requests
 from lxml import etree
 from config import Config
 import base64
 
+import otm_client
+
 # ============================================================
 # NAMESPACES
 # ============================================================
@@ -19,12 +20,11 @@ def post_to_otm(xml_bytes):
 
     print("📤 Sending XML to OTM...")
 
-    response = requests.post(
+    response = otm_client.post(
         Config.OTM_URL,
         data=xml_bytes,
         headers={"Content-Type": "application/xml"},
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=120
+        timeout=Config.OTM_TIMEOUT
     )
 
     raw_xml = response.text
@@ -66,12 +66,12 @@ def get_otm_status(transmission_no):
     </sql2xml>
     """
 
-    response = requests.post(
+    response = otm_client.post(
         Config.OTM_DBXML_URL,
         data=sql,
         headers={"Content-Type": "application/xml"},
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=60
+        timeout=Config.OTM_QUERY_TIMEOUT,
+        idempotent=True  # read-only query
     )
 
     root = etree.fromstring(response.text.encode())
@@ -83,10 +83,64 @@ def get_otm_status(transmission_no):
     return "UNKNOWN"
 
 
+# ============================================================
+# GET TRANSACTION STATUS (PACKED TRANSMISSIONS)
+# ============================================================
+# A packed transmission carries one GLogXMLElement per invoice and the
+# Invoice rows only know their position in it (transmission_seq); the
+# I_TRANSACTION rows carry no invoice xid to match on. OTM splits an
+# inbound transmission into transactions in element order, numbering them
+# from one ascending sequence, so the n-th lowest I_TRANSACTION_NO of a
+# transmission belongs to the n-th element.
+def transaction_at(transactions, seq):
+    """
+    (I_TRANSACTION_NO, STATUS) of the seq-th (1-based) element, given a
+    transmission's [(I_TRANSACTION_NO, STATUS), ...] in any order; None
+    while OTM has not created that transaction yet.
+    """
+    ordered = sorted(transactions, key=lambda t: int(t[0]))
+    if len(ordered) < seq:
+        return None
+    return ordered[seq - 1]
+
+
+def get_otm_transaction_status(transmission_no, seq):
+    """
+    Status of the seq-th (1-based) GLogXMLElement of a transmission.
+    Returns (status, transaction_no); falls back to the transmission
+    status while the transactions are not created yet.
+    """
+
+    rows = dbxml_query("I_TRANSACTION", f"""
+          SELECT I_TRANSACTION_NO, STATUS
+          FROM I_TRANSACTION
+          WHERE I_TRANSMISSION_NO = {int(transmission_no)}""")
+
+    transaction = transaction_at(
+        [
+            (node.attrib.get("I_TRANSACTION_NO"), node.attrib.get("STATUS", "UNKNOWN"))
+            for node in rows
+        ],
+        seq
+    )
+
+    if transaction is not None:
+        transaction_no, status = transaction
+        return status, transaction_no
+
+    return get_otm_status(transmission_no), None
+
+
 # ============================================================
 # FETCH ERROR MESSAGE FROM I_LOG
 # ============================================================
-def get_transmission_error_report(transmission_no):
+def get_transmission_error_report(transmission_no, transaction_no=None):
+
+    # packed transmissions log per transaction; narrow to one invoice
+    transaction_filter = (
+        f"AND I_TRANSACTION_NO = {int(transaction_no)}"
+        if transaction_no else ""
+    )
 
     sql = f"""
     <sql2xml>
@@ -97,36 +151,143 @@ def get_transmission_error_report(transmission_no):
           FROM I_LOG
           WHERE I_TRANSMISSION_NO = {transmission_no}
             AND WRITTEN_BY = 'InvoiceInterface'
+            {transaction_filter}
         </Statement>
       </Query>
     </sql2xml>
     """
 
-    response = requests.post(
+    response = otm_client.post(
         Config.OTM_DBXML_URL,
         data=sql,
         headers={"Content-Type": "application/xml"},
-        auth=(Config.OTM_USERNAME, Config.OTM_PASSWORD),
-        timeout=60
+        timeout=Config.OTM_QUERY_TIMEOUT,
+        idempotent=True  # read-only query
     )
 
     root = etree.fromstring(response.text.encode())
 
-    errors = []
+    errors = [format_log_entry(log) for log in root.findall(".//I_LOG")]
+
+    return "\n".join(errors)
+
+
+def format_log_entry(log):
+    """'<code> : <text>' for an I_LOG row; the text comes base64 encoded"""
+
+    code = log.attrib.get("I_MESSAGE_CODE")
+    encoded_msg = log.attrib.get("I_MESSAGE_TEXT")
 
-    for log in root.findall(".//I_LOG"):
+    decoded_msg = None
 
-        code = log.attrib.get("I_MESSAGE_CODE")
-        encoded_msg = log.attrib.get("I_MESSAGE_TEXT")
+    if encoded_msg:
+        try:
+            decoded_msg = base64.b64decode(encoded_msg).decode("utf-8")
+        except Exception:
+            decoded_msg = encoded_msg
 
-        decoded_msg = None
+    return f"{code} : {decoded_msg}"
+
+
+# ============================================================
+# BULK QUERIES (MANY TRANSMISSIONS PER ROUND TRIP)
+# ============================================================
+def chunked(values, size):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
 
-        if encoded_msg:
-            try:
-                decoded_msg = base64.b64decode(encoded_msg).decode("utf-8")
-            except Exception:
-                decoded_msg = encoded_msg
 
-        errors.append(f"{code} : {decoded_msg}")
+def dbxml_query(root_name, statement):
+    """Runs one sql2xml query and returns its row elements"""
+
+    sql = f"""
+    <sql2xml>
+      <Query>
+        <RootName>{root_name}</RootName>
+        <Statement>
+          {statement}
+        </Statement>
+      </Query>
+    </sql2xml>
+    """
+
+    response = otm_client.post(
+        Config.OTM_DBXML_URL,
+        data=sql,
+        headers={"Content-Type": "application/xml"},
+        timeout=Config.OTM_QUERY_TIMEOUT,
+        idempotent=True  # read-only query
+    )
+
+    root = etree.fromstring(response.text.encode())
+    return root.findall(f".//{root_name}")
+
+
+def in_list(numbers):
+    # only integers ever reach the SQL text
+    return ", ".join(str(int(n)) for n in numbers)
+
+
+def get_otm_statuses(transmission_nos):
+    """{transmission_no: STATUS} using one IN (...) query per chunk"""
+
+    statuses = {}
+
+    for chunk in chunked(transmission_nos, Config.OTM_DBXML_IN_CHUNK):
+        rows = dbxml_query("I_Transmission", f"""
+          SELECT I_TRANSMISSION_NO, STATUS
+          FROM I_Transmission
+          WHERE I_Transmission_No IN ({in_list(chunk)})""")
+
+        for node in rows:
+            statuses[int(node.attrib["I_TRANSMISSION_NO"])] = node.attrib.get("STATUS", "UNKNOWN")
+
+    return statuses
+
+
+def get_otm_transaction_statuses(transmission_nos):
+    """
+    {transmission_no: [(I_TRANSACTION_NO, STATUS), ...]}; pick an
+    invoice's transaction with transaction_at()
+    """
+
+    transactions = {}
+
+    for chunk in chunked(transmission_nos, Config.OTM_DBXML_IN_CHUNK):
+        rows = dbxml_query("I_TRANSACTION", f"""
+          SELECT I_TRANSMISSION_NO, I_TRANSACTION_NO, STATUS
+          FROM I_TRANSACTION
+          WHERE I_TRANSMISSION_NO IN ({in_list(chunk)})""")
+
+        for node in rows:
+            transactions.setdefault(int(node.attrib["I_TRANSMISSION_NO"]), []).append((
+                node.attrib.get("I_TRANSACTION_NO"),
+                node.attrib.get("STATUS", "UNKNOWN")
+            ))
+
+    return transactions
+
+
+def get_transmission_error_reports(transmission_nos):
+    """
+    {transmission_no: [(I_TRANSACTION_NO, '<code> : <text>'), ...]}
+    from I_LOG, one query per chunk
+    """
+
+    reports = {}
+
+    for chunk in chunked(transmission_nos, Config.OTM_DBXML_IN_CHUNK):
+        rows = dbxml_query("I_LOG", f"""
+          SELECT I_TRANSMISSION_NO, I_TRANSACTION_NO, I_MESSAGE_CODE, I_MESSAGE_TEXT
+          FROM I_LOG
+          WHERE I_TRANSMISSION_NO IN ({in_list(chunk)})
+            AND WRITTEN_BY = 'InvoiceInterface'""")
+
+        for log in rows:
+            reports.setdefault(int(log.attrib["I_TRANSMISSION_NO"]), []).append((
+                log.attrib.get("I_TRANSACTION_NO"),
+                format_log_entry(log)
+            ))
 
-    return "\n".join(errors)
\ No newline at end of file
+    return reports
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Invoice payload bodies (request/response XML and JSON), kept out of the
+invoices table.
+
+Each distinct body is stored once in payload_archive, gzip-compressed and
+keyed by the sha256 of its text; an invoice row only holds the hashes
+(request_xml_hash, ...). Invoice.request_xml and friends read and write
+through ArchivedPayload:
+
+  - reading fetches and decompresses the body on first access only, so
+    listings and status updates never touch it
+  - writing hashes the body and queues it on the session; every flush
+    inserts the queued bodies in one statement, skipping hashes that are
+    already archived
+"""
+import gzip
+import hashlib
+import json
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database import db
+
+CODEC = "gzip"
+COMPRESS_LEVEL = 6
+
+PENDING_KEY = "pending_payloads"
+
+
+# ============================================================
+# ENCODING
+# ============================================================
+def encode_payload(kind, value):
+    """Stored text of value as UTF-8 bytes; kind is "xml" or "json" """
+    if kind == "json":
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = value
+    return text.encode("utf-8")
+
+
+def decode_payload(kind, data):
+    text = data.decode("utf-8")
+    return json.loads(text) if kind == "json" else text
+
+
+def payload_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data):
+    # mtime=0: the same body always compresses to the same bytes
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def decompress(codec, data):
+    if codec != CODEC:
+        raise ValueError(f"Unknown payload codec: {codec}")
+    return gzip.decompress(data)
+
+
+# has_json on the invoice listing treats these as "no JSON"
+EMPTY_JSON_HASHES = [
+    payload_hash(encode_payload("json", value)) for value in ({}, [], "")
+]
+EMPTY_XML_HASH = payload_hash(encode_payload("xml", ""))
+
+
+# ============================================================
+# ARCHIVE ACCESS
+# ============================================================
+def archive_table():
+    return db.metadata.tables["payload_archive"]
+
+
+def stage_payload(kind, value):
+    """Queues value for the next flush; returns its hash (None for None)"""
+    if value is None:
+        return None
+
+    data = encode_payload(kind, value)
+    digest = payload_hash(data)
+
+    pending = db.session.info.setdefault(PENDING_KEY, {})
+    if digest not in pending:
+        pending[digest] = {
+            "hash": digest,
+            "codec": CODEC,
+            "size": len(data),
+            "body": compress(data)
+        }
+    return digest
+
+
+def load_payload(kind, digest):
+    pending = db.session.info.get(PENDING_KEY, {}).get(digest)
+    if pending is not None:
+        return decode_payload(kind, decompress(pending["codec"], pending["body"]))
+
+    table = archive_table()
+    row = db.session.execute(
+        db.select(table.c.codec, table.c.body).where(table.c.hash == digest)
+    ).one_or_none()
+
+    if row is None:
+        return None
+    return decode_payload(kind, decompress(row.codec, row.body))
+
+
+def flush_payloads(session):
+    """
+    Inserts the queued bodies. Runs before every flush; call it directly
+    before a bulk insert that sets the *_hash columns itself.
+    """
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    stmt = pg_insert(archive_table()).on_conflict_do_nothing(index_elements=["hash"])
+    session.execute(stmt, list(pending.values()))
+
+
+@event.listens_for(Session, "before_flush")
+def flush_pending_payloads(session, flush_context, instances):
+    flush_payloads(session)
+
+
+# ============================================================
+# MODEL ATTRIBUTE
+# ============================================================
+class ArchivedPayload:
+    """
+    Invoice attribute whose body lives in payload_archive; the mapped
+    <name>_hash column holds the key. Filter on the hash column in SQL.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.hash_attr = f"{name}_hash"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        digest = getattr(obj, self.hash_attr)
+        if digest is None:
+            return None
+
+        loaded = vars(obj).setdefault("_payloads", {})
+        cached = loaded.get(self.name)
+        if cached is None or cached[0] != digest:
+            cached = loaded[self.name] = (digest, load_payload(self.kind, digest))
+        return cached[1]
+
+    def __set__(self, obj, value):
+        digest = stage_payload(self.kind, value)
+        setattr(obj, self.hash_attr, digest)
+        vars(obj).setdefault("_payloads", {})[self.name] = (digest, value)
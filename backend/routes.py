@@ -1,23 +1,34 @@
-from flask import Blueprint, request, jsonify
-import pandas as pd
+from flask import Blueprint, request, jsonify, current_app
+import base64
 import json
+from datetime import datetime, timedelta
 
 from database import db
-from models import Invoice
+from models import Invoice, UploadJob
 
-from xml_builder import build_invoice_xml
-from json_builder import build_invoice_json_from_excel
+from upload_service import process_xml_upload, process_json_upload
+from status_refresh import refresh_invoices
 
 
 from otm_service import (
     post_to_otm,
     get_otm_status,
+    get_otm_transaction_status,
     get_transmission_error_report
 )
 
 from otm_rest_service import post_excel_json_invoice_to_otm, get_otm_metadata
-from models import Invoice, OtmObjectMetadata, MetadataField
+from models import Invoice, OtmObjectMetadata
 from invoice_template_routes import invoice_template_bp
+from catalog_service import (
+    get_classification_from_catalog,
+    get_catalog_modules,
+    catalog_version
+)
+from http_cache import conditional_json
+from template_store import get_template
+from payload_store import EMPTY_XML_HASH, EMPTY_JSON_HASHES
+from metadata_sync import store_object_metadata, sync_all_metadata
 
 bp = Blueprint("api", __name__)
 
@@ -25,8 +36,21 @@ bp = Blueprint("api", __name__)
 bp.register_blueprint(invoice_template_bp)
 
 
+def form_flag(name, config_key):
+    """Form field <name>=true|false wins over the Config default"""
+    flag = request.form.get(name)
+    if flag is None:
+        return current_app.config.get(config_key, False)
+    return flag.strip().lower() in ("1", "true", "yes", "on")
+
+
+def use_async_upload():
+    return form_flag("async", "UPLOAD_ASYNC")
 
 
+def use_streaming_upload():
+    return form_flag("streaming", "EXCEL_STREAMING")
+
 
 # ============================================================
 # UPLOAD EXCEL → XML OR JSON → SEND TO OTM
@@ -36,127 +60,243 @@ def upload_invoice():
 
     file = request.files.get("file")
     process_type = request.form.get("processType")  # xml | json
+    template_id = request.form.get("templateId")
 
     if not file or not process_type:
         return {"error": "File or processType missing"}, 400
 
+    if process_type not in ("xml", "json"):
+        return {"error": "Invalid processType"}, 400
+
+    # optional template: its field id -> column mapping picks the columns
+    template = get_template(template_id) if template_id else None
+    if template_id and template is None:
+        return {"error": "Template not found"}, 404
+
+    mapping = template["mapping"] if template else None
+
+    # ==========================
+    # ASYNC: QUEUE FOR WORKERS
+    # ==========================
+    if use_async_upload():
+        job = UploadJob(
+            status="QUEUED",
+            process_type=process_type,
+            streaming=use_streaming_upload(),
+            template_id=template["id"] if template else None,
+            filename=file.filename,
+            file_data=file.read()
+        )
+
+        db.session.add(job)
+        db.session.commit()
+
+        return jsonify({
+            "message": "Upload queued",
+            "job_id": job.id,
+            "status_url": f"/api/jobs/{job.id}"
+        }), 202
+
     try:
         # ==========================
         # XML FLOW (MULTI-INVOICE)
         # ==========================
         if process_type == "xml":
-            df = pd.read_excel(file)
-
-            grouped = df.groupby("INVOICE_XID")
+            result = process_xml_upload(
+                file,
+                streaming=use_streaming_upload(),
+                field_mapping=mapping
+            )
 
-            results = []
+        # ==========================
+        # JSON FLOW
+        # ==========================
+        else:
+            result = process_json_upload(file, field_mapping=mapping)
 
-            for invoice_xid, invoice_df in grouped:
+        db.session.commit()
 
-                invoice_num = str(invoice_df.iloc[0]["INVOICE_NUM"])
+        return jsonify(result)
 
-                xml_bytes, xml_string = build_invoice_xml(invoice_df)
-                response_xml, transmission_no = post_to_otm(xml_bytes)
+    except Exception as e:
+        db.session.rollback()
+        return {"error": str(e)}, 500
 
-                invoice = Invoice(
-                    invoice_xid=invoice_xid,
-                    invoice_num=invoice_num,
-                    transmission_no=transmission_no,
-                    status="RECEIVED",
 
-                    request_xml=xml_string,
-                    request_json=None,
+# ============================================================
+# UPLOAD JOB PROGRESS
+# ============================================================
+@bp.route("/jobs/<int:id>", methods=["GET"])
+def upload_job_status(id):
 
-                    response_xml=response_xml,
-                    error_message=None,
+    job = UploadJob.query.get_or_404(id)
 
-                    source_type="XML"
-                )
+    end = job.finished_at or job.updated_at
+    elapsed = (
+        (end - job.started_at).total_seconds()
+        if job.started_at and end else None
+    )
 
-                db.session.add(invoice)
+    return jsonify({
+        "id": job.id,
+        "status": job.status,
+        "process_type": job.process_type,
+        "filename": job.filename,
+
+        "invoices_done": job.invoices_done or 0,
+        "invoices_failed": job.invoices_failed or 0,
+        "elapsed_seconds": elapsed,
+        "invoices_per_second": (
+            round((job.invoices_done or 0) / elapsed, 2) if elapsed else None
+        ),
+
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+
+        "error_message": job.error_message,
+        "result": job.result
+    })
 
-                results.append({
-                    "invoiceXid": invoice_xid,
-                    "invoiceNumber": invoice_num,
-                    "transmission_no": transmission_no
-                })
 
-            db.session.commit()
+# ============================================================
+# KEYSET CURSOR
+# ============================================================
+def encode_cursor(created_at, id):
+    raw = f"{created_at.isoformat() if created_at else ''}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-            return jsonify({
-                "message": "Invoices created using XML",
-                "count": len(results),
-                "invoices": results
-            })
 
-        # ==========================
-        # JSON FLOW
-        # ==========================
-        elif process_type == "json":
-            json_payload = build_invoice_json_from_excel(file)
-            otm_response = post_excel_json_invoice_to_otm(json_payload)
-
-            invoice = Invoice(
-                invoice_xid=json_payload["invoiceXid"],
-                invoice_num=json_payload["invoiceNumber"],
-                transmission_no=(
-                    otm_response.get("transmissionNo")
-                    or otm_response.get("id")
-                ),
-                status="RECEIVED",
-
-                request_xml=None,
-                request_json=json_payload,
-
-                response_xml=json.dumps(otm_response),
-                error_message=None,
-
-                source_type="JSON"
-            )
+def decode_cursor(cursor):
+    """Returns (created_at, id); raises ValueError on a bad cursor"""
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return (datetime.fromisoformat(created_at) if created_at else None), int(id)
+    except Exception:
+        raise ValueError("Invalid cursor")
 
-            db.session.add(invoice)
-            db.session.commit()
 
-            return jsonify({
-                "message": "Invoice created using JSON",
-                "invoiceXid": invoice.invoice_xid,
-                "invoiceNumber": invoice.invoice_num,
-                "transmission_no": invoice.transmission_no
-            })
+def parse_date_arg(name, end_of_day=False):
+    """ISO date or datetime query arg; a bare date_to covers the whole day"""
+    value = request.args.get(name)
+    if not value:
+        return None
 
-        return {"error": "Invalid processType"}, 400
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}")
 
-    except Exception as e:
-        return {"error": str(e)}, 500
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
 
 
 # ============================================================
 # FETCH ALL INVOICES
 # ============================================================
+# Only the listed columns are selected; has_xml / has_json are computed
+# in SQL from the payload hashes, so no payload body is read for a
+# listing. Empty bodies ("", {}, [], "") have known hashes.
+#
+# Query args (all optional):
+#   status=ERROR,RECEIVED   source_type=XML|JSON
+#   date_from / date_to     ISO date or datetime on created_at
+#   limit=N, cursor=...     keyset page on (created_at, id), newest first;
+#                           the next page's cursor is in X-Next-Cursor
+#
+# Without limit the first INVOICE_PAGE_DEFAULT_LIMIT rows are returned;
+# follow X-Next-Cursor for the rest.
 @bp.route("/invoices", methods=["GET"])
 def invoices():
 
-    invoices = Invoice.query.order_by(
-        Invoice.created_at.desc()
-    ).all()
+    has_xml = db.and_(
+        Invoice.request_xml_hash.isnot(None),
+        Invoice.request_xml_hash != EMPTY_XML_HASH
+    )
+    has_json = db.and_(
+        Invoice.request_json_hash.isnot(None),
+        Invoice.request_json_hash.notin_(EMPTY_JSON_HASHES)
+    )
+
+    stmt = db.select(
+        Invoice.id,
+        Invoice.invoice_xid,
+        Invoice.invoice_num,
+        Invoice.transmission_no,
+        Invoice.status,
+        Invoice.error_message,
+        has_json.label("has_json"),
+        has_xml.label("has_xml"),
+        Invoice.source_type,
+        Invoice.created_at
+    )
+
+    statuses = [s.strip() for s in request.args.get("status", "").split(",") if s.strip()]
+    if statuses:
+        stmt = stmt.where(Invoice.status.in_(statuses))
+
+    source_type = request.args.get("source_type")
+    if source_type:
+        stmt = stmt.where(Invoice.source_type == source_type)
+
+    try:
+        date_from = parse_date_arg("date_from")
+        date_to = parse_date_arg("date_to", end_of_day=True)
+        cursor = request.args.get("cursor")
+        after = decode_cursor(cursor) if cursor else None
+        limit = request.args.get(
+            "limit", current_app.config["INVOICE_PAGE_DEFAULT_LIMIT"], type=int
+        )
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    if date_from:
+        stmt = stmt.where(Invoice.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(Invoice.created_at < date_to)
+
+    if after:
+        created_at, last_id = after
+        stmt = stmt.where(
+            db.tuple_(Invoice.created_at, Invoice.id) < db.tuple_(created_at, last_id)
+        )
+
+    stmt = stmt.order_by(Invoice.created_at.desc(), Invoice.id.desc())
+
+    limit = max(1, min(limit, current_app.config["INVOICE_PAGE_MAX_LIMIT"]))
+    # one extra row tells whether another page follows
+    stmt = stmt.limit(limit + 1)
+
+    rows = db.session.execute(stmt).all()
 
-    return jsonify([
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    response = jsonify([
         {
-            "id": i.id,
-            "invoice_xid": i.invoice_xid,
-            "invoice_num": i.invoice_num,
-            "transmission_no": i.transmission_no,
-            "status": i.status,
-            "error_message": i.error_message,
+            "id": r.id,
+            "invoice_xid": r.invoice_xid,
+            "invoice_num": r.invoice_num,
+            "transmission_no": r.transmission_no,
+            "status": r.status,
+            "error_message": r.error_message,
 
-            "has_json": bool(i.request_json),
-            "has_xml": bool(i.request_xml),
+            "has_json": bool(r.has_json),
+            "has_xml": bool(r.has_xml),
 
-            "source_type": i.source_type
+            "source_type": r.source_type
         }
-        for i in invoices
+        for r in rows
     ])
 
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return response
+
 
 # ============================================================
 # REFRESH STATUS (XML ONLY)
@@ -175,12 +315,23 @@ def refresh(id):
             "error_message": inv.error_message
         })
 
-    status = get_otm_status(inv.transmission_no)
+    transaction_no = None
+
+    # packed transmissions: read this invoice's own transaction
+    if inv.transmission_seq:
+        status, transaction_no = get_otm_transaction_status(
+            inv.transmission_no,
+            inv.transmission_seq
+        )
+    else:
+        status = get_otm_status(inv.transmission_no)
+
     inv.status = status
 
     if status == "ERROR":
         inv.error_message = get_transmission_error_report(
-            inv.transmission_no
+            inv.transmission_no,
+            transaction_no
         )
 
     db.session.commit()
@@ -191,6 +342,61 @@ def refresh(id):
     })
 
 
+# ============================================================
+# BULK REFRESH STATUS (XML ONLY)
+# ============================================================
+@bp.route("/refresh", methods=["POST"])
+def refresh_bulk():
+    """
+    Body: {"ids": [1, 2, ...]} or {"status": "RECEIVED" | [...], "limit": 500}
+    """
+
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids")
+    status = data.get("status")
+
+    if not ids and not status:
+        return {"error": "ids or status required"}, 400
+
+    if ids and not (
+        isinstance(ids, list)
+        and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    ):
+        return {"error": "ids must be a list of integers"}, 400
+
+    limit = data.get("limit") or current_app.config["REFRESH_BULK_LIMIT"]
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        return {"error": "limit must be a positive integer"}, 400
+
+    query = Invoice.query.filter(
+        Invoice.transmission_no.isnot(None),
+        db.or_(Invoice.source_type.is_(None), Invoice.source_type != "JSON")
+    )
+
+    if ids:
+        query = query.filter(Invoice.id.in_(ids))
+    else:
+        statuses = status if isinstance(status, list) else [status]
+        limit = min(limit, current_app.config["REFRESH_BULK_LIMIT"])
+        query = (
+            query.filter(Invoice.status.in_(statuses))
+            .order_by(Invoice.created_at.desc())
+            .limit(limit)
+        )
+
+    try:
+        results = refresh_invoices(query.all())
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {"error": str(e)}, 502
+
+    return jsonify({
+        "count": len(results),
+        "invoices": results
+    })
+
+
 # ============================================================
 # 🔁 RESEND INVOICE (XML + JSON)
 # ============================================================
@@ -205,6 +411,7 @@ def resend_invoice(id):
                 inv.request_xml.encode("utf-8")
             )
             inv.transmission_no = transmission_no
+            inv.transmission_seq = None
             inv.response_xml = response_xml
 
         elif inv.source_type == "JSON" and inv.request_json:
@@ -323,24 +530,6 @@ def upload_raw_json():
     except Exception as e:
         return {"error": str(e)}, 500
 # ============================================================
-# OTM CATALOG LOADING
-# ============================================================
-def load_otm_catalog():
-    import os
-    path = os.path.join(os.path.dirname(__file__), "otm_catalog.json")
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return {"MASTER": [], "TRANSACTION": [], "POWER": []}
-
-def get_classification_from_catalog(object_name):
-    catalog = load_otm_catalog()
-    for category, items in catalog.items():
-        if any(i['name'] == object_name for i in items):
-            return category
-    return "TRANSACTION"
-
-# ============================================================
 # SYNC OTM METADATA
 # ============================================================
 @bp.route("/metadata/sync/<object_name>", methods=["POST"])
@@ -350,49 +539,52 @@ def sync_metadata(object_name):
     if status_code != 200:
         return jsonify(data), status_code
 
-    # Check classification from catalog
-    classification = get_classification_from_catalog(object_name)
-
-    # Update or create Header
-    metadata = OtmObjectMetadata.query.filter_by(object_name=object_name).first()
-    if not metadata:
-        metadata = OtmObjectMetadata(object_name=object_name, classification=classification)
-        db.session.add(metadata)
-    else:
-        metadata.classification = classification
-        metadata.last_synced = db.func.now()
-
-    # Clear existing fields
-    MetadataField.query.filter_by(metadata_id=metadata.id).delete()
-
-    # Add new fields from metadata-catalog
-    # The structure of OTM metadata-catalog Usually has "attributes" or "properties"
-    # We will simple extract top-level names for now
-    items = data.get("attributes", [])
-    for item in items:
-        field = MetadataField(
-            object_metadata=metadata,
-            field_name=item.get("name"),
-            data_type=item.get("type"),
-            is_required=not item.get("nullable", True)
-        )
-        db.session.add(field)
-
+    summary = store_object_metadata(object_name, data)
     db.session.commit()
 
     return jsonify({
         "message": f"Metadata for {object_name} synced successfully",
-        "fields_count": len(items),
-        "classification": classification
+        "classification": get_classification_from_catalog(object_name),
+        **summary
     })
 
+
+# ============================================================
+# SYNC ALL CATALOG OBJECTS (PARALLEL FETCH, ONE TRANSACTION)
+# ============================================================
+@bp.route("/metadata/sync-all", methods=["POST"])
+def sync_all_metadata_route():
+    # optional body: {"objects": ["locations", ...]}; default = whole catalog
+    body = request.get_json(silent=True) or {}
+
+    try:
+        summary = sync_all_metadata(body.get("objects"))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Sync failed: {str(e)}"}), 500
+
+    return jsonify(summary)
+
 # ============================================================
 # DASHBOARD MODULES
 # ============================================================
 @bp.route("/dashboard/modules", methods=["GET"])
 def get_dashboard_modules():
-    catalog = load_otm_catalog()
-    otm_meta = {m.object_name: m for m in OtmObjectMetadata.query.all()}
+    # catalog file + sync state; unchanged -> 304 / cached body
+    sync_state = db.session.execute(
+        db.select(db.func.count(), db.func.max(OtmObjectMetadata.last_synced))
+    ).one()
+    version = (catalog_version(), *sync_state)
+
+    return conditional_json("dashboard-modules", version, build_dashboard_modules)
+
+
+def build_dashboard_modules():
+    # sync status only; the module list itself is prebuilt (catalog_service.py)
+    last_synced = dict(db.session.execute(
+        db.select(OtmObjectMetadata.object_name, OtmObjectMetadata.last_synced)
+    ).all())
 
     modules = {
         "MASTER": [],
@@ -400,20 +592,14 @@ def get_dashboard_modules():
         "POWER": []
     }
 
-    for category, items in catalog.items():
+    for category, items in get_catalog_modules().items():
         for item in items:
-            db_entry = otm_meta.get(item['name'])
-            
-            # Start with catalog data and add sync status
+            synced = last_synced.get(item['name'])
+
             module = item.copy()
-            module.update({
-                "title": item.get('display', item['name']),
-                "path": item.get('path', f"/{item['name']}"),
-                "last_synced": db_entry.last_synced.isoformat() if db_entry and db_entry.last_synced else None,
-                "is_synced": bool(db_entry and db_entry.last_synced),
-                "is_app": item.get('is_app', False)
-            })
-            
-            modules[category].append(module)
-
-    return jsonify(modules)
+            module["last_synced"] = synced.isoformat() if synced else None
+            module["is_synced"] = bool(synced)
+
+            modules.setdefault(category, []).append(module)
+
+    return modules
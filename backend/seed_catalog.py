@@ -1,13 +1,13 @@
-import json
 from app import create_app
 from database import db
 from models import OtmObjectMetadata
+from catalog_service import reload_catalog
 
 app = create_app()
 
 def seed_catalog():
-    with open('otm_catalog.json', 'r') as f:
-        catalog = json.load(f)
+    # re-read otm_catalog.json (the server picks changes up by mtime)
+    catalog = reload_catalog()
 
     with app.app_context():
         total_added = 0
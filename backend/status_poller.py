@@ -0,0 +1,152 @@
+"""
+Background poller for OTM transmission status.
+
+Every XML invoice that is not in a terminal status (COMPLETE / ERROR by
+default) is refreshed in batches through status_refresh.refresh_invoices.
+Each invoice gets a next_poll_at that grows with its age, so fresh
+invoices are checked often and old stragglers rarely. A per-minute
+budget caps how many invoices are polled, i.e. the load put on OTM.
+Error logs are pulled once, when an invoice turns ERROR.
+
+Batches are claimed with FOR UPDATE SKIP LOCKED, so several pollers
+(threads or processes) never refresh the same invoice twice.
+
+Run standalone with:
+    python status_poller.py
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import load_only
+
+from database import db
+from models import Invoice
+from status_refresh import refresh_invoices
+
+
+# ============================================================
+# BACKOFF
+# ============================================================
+def next_poll_delay(age_seconds, config):
+    """Proportional to invoice age, clamped to [min, max] interval"""
+    delay = age_seconds * config["POLL_BACKOFF_FACTOR"]
+    return max(
+        config["POLL_MIN_INTERVAL_SECONDS"],
+        min(delay, config["POLL_MAX_INTERVAL_SECONDS"])
+    )
+
+
+# ============================================================
+# ONE POLL CYCLE
+# ============================================================
+def poll_once(config, limit):
+    """Refreshes up to limit due invoices; returns how many were polled"""
+
+    if limit <= 0:
+        return 0
+
+    # DB clock, the same one that filled created_at
+    now = db.session.scalar(db.select(db.func.localtimestamp()))
+    max_age = timedelta(hours=config["POLL_MAX_AGE_HOURS"])
+    settle = timedelta(seconds=config["POLL_MIN_INTERVAL_SECONDS"])
+
+    stmt = (
+        db.select(Invoice)
+        # the XML/JSON payload columns are never needed here
+        .options(load_only(
+            Invoice.id, Invoice.status, Invoice.transmission_no,
+            Invoice.transmission_seq, Invoice.source_type,
+            Invoice.error_message, Invoice.created_at, Invoice.next_poll_at
+        ))
+        .where(
+            Invoice.transmission_no.isnot(None),
+            db.or_(Invoice.source_type.is_(None), Invoice.source_type != "JSON"),
+            db.or_(
+                Invoice.status.is_(None),
+                Invoice.status.notin_(config["POLL_TERMINAL_STATUSES"])
+            ),
+            Invoice.created_at > now - max_age,
+            Invoice.created_at <= now - settle,
+            db.or_(Invoice.next_poll_at.is_(None), Invoice.next_poll_at <= now)
+        )
+        .order_by(Invoice.next_poll_at.asc().nullsfirst(), Invoice.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    invoices = db.session.execute(stmt).scalars().all()
+
+    if not invoices:
+        db.session.rollback()
+        return 0
+
+    try:
+        refresh_invoices(invoices)
+    except Exception:
+        # OTM unreachable: push the batch back instead of hammering it
+        logging.exception("Status poll failed")
+
+    for inv in invoices:
+        age = (now - inv.created_at).total_seconds()
+        inv.next_poll_at = now + timedelta(seconds=next_poll_delay(age, config))
+
+    db.session.commit()
+    return len(invoices)
+
+
+# ============================================================
+# POLLER LOOP (TOKEN BUCKET BUDGET)
+# ============================================================
+def poller_loop(app):
+    config = app.config
+    per_minute = config["POLL_BUDGET_PER_MINUTE"]
+    batch_size = config["POLL_BATCH_SIZE"]
+    tick = config["POLL_TICK_SECONDS"]
+
+    tokens = float(per_minute)
+    last = time.monotonic()
+
+    while True:
+        now = time.monotonic()
+        tokens = min(per_minute, tokens + (now - last) * per_minute / 60)
+        last = now
+
+        polled = 0
+        with app.app_context():
+            try:
+                polled = poll_once(config, min(batch_size, int(tokens)))
+            except Exception:
+                logging.exception("Status poller error")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+        tokens -= polled
+
+        # keep going while a full batch came back and budget remains
+        if polled < batch_size or tokens < batch_size:
+            time.sleep(tick)
+
+
+def start_status_poller(app):
+    if not app.config.get("STATUS_POLLER_ENABLED", True):
+        return None
+
+    t = threading.Thread(
+        target=poller_loop,
+        args=(app,),
+        name="otm-status-poller",
+        daemon=True
+    )
+    t.start()
+    return t
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO)
+    print("🛰️ OTM status poller started")
+    poller_loop(app)
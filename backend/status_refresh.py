@@ -0,0 +1,78 @@
+from otm_service import (
+    get_otm_statuses,
+    get_otm_transaction_statuses,
+    get_transmission_error_reports,
+    transaction_at
+)
+
+
+# ============================================================
+# BULK STATUS REFRESH (XML INVOICES)
+# ============================================================
+# Same rules as /refresh/<id>, but for many invoices at once: one
+# I_Transmission query, one I_TRANSACTION query for packed transmissions
+# and one I_LOG query for the errored ones (each chunked to
+# Config.OTM_DBXML_IN_CHUNK). Updates the Invoice objects in place; the
+# caller commits.
+def transmission_number(inv):
+    no = str(inv.transmission_no or "").strip()
+    return int(no) if no.isdigit() else None
+
+
+def refresh_invoices(invoices):
+    targets = [
+        inv for inv in invoices
+        if inv.source_type != "JSON" and transmission_number(inv) is not None
+    ]
+
+    if not targets:
+        return []
+
+    transmission_nos = sorted({transmission_number(inv) for inv in targets})
+    packed_nos = sorted({
+        transmission_number(inv) for inv in targets if inv.transmission_seq
+    })
+
+    statuses = get_otm_statuses(transmission_nos)
+    transactions = get_otm_transaction_statuses(packed_nos) if packed_nos else {}
+
+    transaction_of = {}
+
+    for inv in targets:
+        no = transmission_number(inv)
+        status = statuses.get(no, "UNKNOWN")
+
+        # packed: this invoice's own transaction, once OTM created it
+        transaction = (
+            transaction_at(transactions.get(no, []), inv.transmission_seq)
+            if inv.transmission_seq else None
+        )
+        if transaction is not None:
+            transaction_no, status = transaction
+            transaction_of[inv.id] = transaction_no
+
+        inv.status = status
+
+    errored = [inv for inv in targets if inv.status == "ERROR"]
+    reports = get_transmission_error_reports(
+        sorted({transmission_number(inv) for inv in errored})
+    ) if errored else {}
+
+    for inv in errored:
+        logs = reports.get(transmission_number(inv), [])
+        transaction_no = transaction_of.get(inv.id)
+
+        inv.error_message = "\n".join(
+            message for log_transaction_no, message in logs
+            if transaction_no is None or log_transaction_no == transaction_no
+        )
+
+    return [
+        {
+            "id": inv.id,
+            "transmission_no": inv.transmission_no,
+            "status": inv.status,
+            "error_message": inv.error_message
+        }
+        for inv in targets
+    ]
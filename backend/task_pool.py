@@ -0,0 +1,42 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============================================================
+# BOUNDED, ORDER-PRESERVING THREAD POOL
+# ============================================================
+def map_in_order(fn, items, max_workers=4):
+    """
+    Runs fn(item) for every item with at most max_workers calls in flight.
+
+    Yields (item, result, error) in the same order as items. An exception
+    raised by one call is returned as its error and does not stop the rest.
+    items may be a generator; it is only consumed a few items ahead of the
+    results, so memory stays bounded for long inputs.
+    """
+    if max_workers <= 1:
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as ex:
+                yield item, None, ex
+        return
+
+    window = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for item in items:
+            window.append((item, pool.submit(fn, item)))
+
+            if len(window) >= max_workers * 2:
+                yield collect(*window.popleft())
+
+        while window:
+            yield collect(*window.popleft())
+
+
+def collect(item, future):
+    try:
+        return item, future.result(), None
+    except Exception as ex:
+        return item, None, ex
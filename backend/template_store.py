@@ -0,0 +1,85 @@
+"""
+Invoice templates, stored in the templates table.
+
+Parsed templates are kept in a small per-process LRU together with the
+precomputed field id -> displayText mapping the upload flow needs, so an
+upload no longer parses and scans every saved template. Saving always
+creates a new template, so cached entries never go stale.
+"""
+import threading
+from collections import OrderedDict
+from uuid import uuid4, UUID
+
+from flask import current_app
+
+from database import db
+from models import InvoiceTemplate
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def field_mapping(fields):
+    return {f["id"]: f["displayText"] for f in fields}
+
+
+def cache_put(template):
+    with _lock:
+        _cache[template["id"]] = template
+        _cache.move_to_end(template["id"])
+        while len(_cache) > current_app.config["TEMPLATE_CACHE_SIZE"]:
+            _cache.popitem(last=False)
+
+
+# ============================================================
+# READ
+# ============================================================
+def get_template(template_id):
+    """{id, name, fields, version, mapping} or None"""
+    if not template_id:
+        return None
+
+    try:
+        template_id = str(UUID(str(template_id)))
+    except ValueError:
+        return None
+
+    with _lock:
+        template = _cache.get(template_id)
+        if template is not None:
+            _cache.move_to_end(template_id)
+            return template
+
+    row = db.session.get(InvoiceTemplate, template_id)
+    if row is None:
+        return None
+
+    template = dict(row.to_dict(), mapping=field_mapping(row.fields))
+    cache_put(template)
+    return template
+
+
+def templates_version():
+    """(count, last update): changes with every save"""
+    return tuple(db.session.execute(
+        db.select(db.func.count(), db.func.max(InvoiceTemplate.updated_at))
+    ).one())
+
+
+def list_templates():
+    rows = InvoiceTemplate.query.order_by(InvoiceTemplate.created_at.asc()).all()
+    return [
+        {"id": t.id, "name": t.name, "fields": t.fields}
+        for t in rows
+    ]
+
+
+# ============================================================
+# WRITE
+# ============================================================
+def create_template(name, fields):
+    """Adds the template to the session; the caller commits"""
+    template = InvoiceTemplate(id=str(uuid4()), name=name, fields=fields)
+    db.session.add(template)
+    return template
+
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """Bare app on in-memory SQLite; each test creates the tables it needs"""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+        TESTING=True
+    )
+    db.init_app(app)
+
+    with app.app_context():
+        yield app
+        db.session.remove()
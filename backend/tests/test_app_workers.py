@@ -0,0 +1,17 @@
+import pytest
+
+from app import reloader_watcher
+
+
+@pytest.mark.parametrize("debug, run_main, watcher", [
+    (True, None, True),       # reloader parent: no background threads
+    (True, "true", False),    # reloader child serving requests
+    (False, None, False),     # no reloader
+])
+def test_background_threads_start_in_one_process(monkeypatch, debug, run_main, watcher):
+    if run_main is None:
+        monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    else:
+        monkeypatch.setenv("WERKZEUG_RUN_MAIN", run_main)
+
+    assert reloader_watcher(debug) is watcher
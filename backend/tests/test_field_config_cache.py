@@ -0,0 +1,52 @@
+import pytest
+
+from database import db
+from item_modules import field_config_cache
+from item_modules.field_config_cache import (
+    bump_field_config_version,
+    get_mandatory_fields
+)
+from item_modules.item_model import FieldConfig
+
+
+@pytest.fixture
+def field_configs(app):
+    app.config["FIELD_CONFIG_RECHECK_SECONDS"] = 60
+    FieldConfig.__table__.create(db.engine)
+
+    db.session.add(FieldConfig(key="item_xid", label="Item ID", display=True, mandatory=True))
+    db.session.commit()
+
+    # drop any snapshot left by another test
+    bump_field_config_version()
+    yield
+    bump_field_config_version()
+
+
+def save_elsewhere(label):
+    """A FieldConfig change committed without bumping this process' version"""
+    db.session.execute(
+        db.update(FieldConfig).where(FieldConfig.key == "item_xid").values(label=label)
+    )
+    db.session.commit()
+
+
+def test_local_save_reloads_at_once(field_configs):
+    assert get_mandatory_fields() == [("item_xid", "Item ID")]
+
+    save_elsewhere("Item XID")
+    bump_field_config_version()
+
+    assert get_mandatory_fields() == [("item_xid", "Item XID")]
+
+
+def test_other_process_save_is_seen_after_recheck(field_configs, monkeypatch):
+    assert get_mandatory_fields() == [("item_xid", "Item ID")]
+
+    save_elsewhere("Item XID")
+    assert get_mandatory_fields() == [("item_xid", "Item ID")]
+
+    now = field_config_cache.time.monotonic()
+    monkeypatch.setattr(field_config_cache.time, "monotonic", lambda: now + 61)
+
+    assert get_mandatory_fields() == [("item_xid", "Item XID")]
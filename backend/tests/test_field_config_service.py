@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import event
+
+from database import db
+from item_modules.item_model import FieldConfig
+from item_modules.field_config_service import (
+    upsert_field_configs,
+    add_missing_field_configs
+)
+
+
+@pytest.fixture
+def field_configs(app):
+    FieldConfig.__table__.create(db.engine)
+
+    # a few keys already configured, so both runs mix inserts and updates
+    db.session.add_all([
+        FieldConfig(key=f"field_{i}", label=f"Field {i}", display=True, mandatory=False)
+        for i in range(2)
+    ])
+    db.session.commit()
+
+
+def count_statements(fn, *args):
+    """Cursor executions made by fn(*args)"""
+    executions = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executions.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn(*args)
+        db.session.flush()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    db.session.rollback()
+    return len(executions), result
+
+
+def entries(n):
+    return [
+        {"key": f"field_{i}", "label": f"Label {i}", "display": True, "mandatory": i % 2 == 0}
+        for i in range(n)
+    ]
+
+
+def test_upsert_statement_count_does_not_grow_with_fields(field_configs):
+    few, few_result = count_statements(upsert_field_configs, entries(3))
+    many, many_result = count_statements(upsert_field_configs, entries(300))
+
+    assert few == many
+    assert few_result == {"inserted": 1, "updated": 2, "unchanged": 0}
+    assert many_result == {"inserted": 298, "updated": 2, "unchanged": 0}
+
+
+def test_upsert_writes_changes_and_skips_unchanged(field_configs):
+    upsert_field_configs(entries(3))
+    db.session.commit()
+
+    result = upsert_field_configs(entries(3) + [{"key": "field_0", "defaultValue": "X"}])
+    db.session.commit()
+
+    assert result == {"inserted": 0, "updated": 1, "unchanged": 2}
+    row = db.session.execute(
+        db.select(FieldConfig).where(FieldConfig.key == "field_0")
+    ).scalar_one()
+    assert (row.label, row.mandatory, row.default_value) == ("Label 0", True, "X")
+
+
+def test_add_missing_statement_count_does_not_grow_with_fields(field_configs):
+    few, _ = count_statements(add_missing_field_configs, [f"field_{i}" for i in range(3)])
+    many, result = count_statements(add_missing_field_configs, [f"field_{i}" for i in range(300)])
+
+    assert few == many
+    assert result == {"inserted": 298, "updated": 0, "unchanged": 2}
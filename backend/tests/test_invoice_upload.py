@@ -0,0 +1,150 @@
+import io
+
+import pandas as pd
+import pytest
+from lxml import etree
+
+import upload_service
+from config import Config
+from database import db
+from models import Invoice, InvoiceTemplate, PayloadArchive, UploadJob
+from routes import bp
+from template_store import create_template
+
+# sheet with renamed invoice columns, as a template maps them
+SHEET = pd.DataFrame({
+    "Invoice Id": ["INV_1", "INV_1", "INV_2"],
+    "Invoice No": ["N1", "N1", "N2"],
+    "INVOICE_DATE": ["01/02/2026", "01/02/2026", "03/02/2026"],
+    "SHIPMENT_GID": ["S1", "S2", "S3"],
+    "COST_TYPE": ["B", "B", "B"],
+    "CURRENCY": ["INR", "INR", "INR"],
+    "AMOUNT": [10, 20, 30],
+})
+
+FIELDS = [
+    {"id": "invoiceXid", "displayText": "Invoice Id"},
+    {"id": "invoiceNumber", "displayText": "Invoice No"},
+]
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    app.config.update(
+        TEMPLATE_CACHE_SIZE=Config.TEMPLATE_CACHE_SIZE,
+        UPLOAD_ASYNC=False,
+        EXCEL_STREAMING=False,
+        OTM_SUBMIT_WORKERS=1
+    )
+    app.register_blueprint(bp, url_prefix="/api")
+    for model in (InvoiceTemplate, Invoice, PayloadArchive, UploadJob):
+        model.__table__.create(db.engine)
+
+    posted = []
+
+    def post_to_otm(xml_bytes):
+        posted.append(etree.fromstring(xml_bytes))
+        return "<ok/>", 900000 + len(posted)
+
+    monkeypatch.setattr(upload_service, "post_to_otm", post_to_otm)
+
+    client = app.test_client()
+    client.posted = posted
+    return client
+
+
+def excel_file():
+    out = io.BytesIO()
+    SHEET.to_excel(out, index=False)
+    out.seek(0)
+    return out
+
+
+def upload(client, **form):
+    data = {"file": (excel_file(), "invoices.xlsx"), "processType": "xml", **form}
+    return client.post("/api/invoice/upload", data=data, content_type="multipart/form-data")
+
+
+@pytest.mark.parametrize("streaming", ["false", "true"])
+def test_template_mapping_picks_the_columns(client, streaming):
+    template = create_template("renamed", FIELDS)
+    db.session.commit()
+
+    response = upload(client, templateId=template.id, streaming=streaming)
+
+    assert response.status_code == 200
+    invoices = response.get_json()["invoices"]
+    assert [(i["invoiceXid"], i["invoiceNumber"]) for i in invoices] == [("INV_1", "N1"), ("INV_2", "N2")]
+    assert len(client.posted) == 2
+
+
+def test_unknown_template_is_rejected(client):
+    response = upload(client, templateId="6f1e3f0c-0000-4000-8000-000000000000")
+
+    assert response.status_code == 404
+    assert client.posted == []
+
+
+def test_async_job_keeps_the_template(client, app):
+    template = create_template("renamed", FIELDS)
+    db.session.commit()
+    app.config["UPLOAD_ASYNC"] = True
+
+    response = upload(client, templateId=template.id)
+
+    assert response.status_code == 202
+    job = db.session.get(UploadJob, response.get_json()["job_id"])
+    assert job.template_id == template.id
+
+
+def test_json_upload_uses_the_template_mapping(client, monkeypatch):
+    sent = []
+
+    def post_json(payload):
+        sent.append(payload)
+        return {"transmissionNo": 800000 + len(sent)}
+
+    monkeypatch.setattr(upload_service, "post_excel_json_invoice_to_otm", post_json)
+    template = create_template("renamed", FIELDS)
+    db.session.commit()
+
+    response = upload(client, templateId=template.id, processType="json")
+
+    assert response.status_code == 200
+    assert response.get_json()["count"] == 2
+    assert [p["invoiceNumber"] for p in sent] == ["N1", "N2"]
+    assert [len(p["lineItems"]["items"]) for p in sent] == [2, 1]
+
+
+@pytest.mark.parametrize("pack_size", [1, 10])
+def test_invoice_that_fails_to_build_is_stored_as_error(client, app, monkeypatch, pack_size):
+    app.config["OTM_PACK_INVOICES"] = pack_size
+    build_invoice_element = upload_service.build_invoice_element
+
+    def failing_build(invoice_df, field_mapping=None):
+        if invoice_df["INVOICE_XID"].iloc[0] == "INV_1":
+            raise ValueError("bad amount")
+        return build_invoice_element(invoice_df, field_mapping)
+
+    monkeypatch.setattr(upload_service, "build_invoice_element", failing_build)
+
+    out = io.BytesIO()
+    SHEET.rename(columns={"Invoice Id": "INVOICE_XID", "Invoice No": "INVOICE_NUM"}).to_excel(out, index=False)
+    out.seek(0)
+    response = client.post(
+        "/api/invoice/upload",
+        data={"file": (out, "invoices.xlsx"), "processType": "xml"},
+        content_type="multipart/form-data"
+    )
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result["count"], result["failed"], result["transmissions"]) == (2, 1, 1)
+    assert [(i["invoiceXid"], i["status"], i["error"]) for i in result["invoices"]] == [
+        ("INV_1", "ERROR", "bad amount"),
+        ("INV_2", "RECEIVED", None),
+    ]
+    assert len(client.posted) == 1
+
+    rows = db.session.execute(db.select(Invoice.invoice_xid, Invoice.status)).all()
+    assert sorted(rows) == [("INV_1", "ERROR"), ("INV_2", "RECEIVED")]
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import event
+
+from database import db
+from item_modules.item_import import upsert_items
+from item_modules.item_model import Item
+
+
+@pytest.fixture
+def items(app):
+    Item.__table__.create(db.engine)
+
+    # one item already imported and synced
+    db.session.add(Item(
+        item_gid="INTL.ITEM_0", item_xid="ITEM_0", item_name="Old",
+        domain_name="INTL", payload={"itemName": "Old"}, otm_sync_status="SUCCESS"
+    ))
+    db.session.commit()
+
+
+def records(n):
+    return [
+        {
+            "item_gid": f"INTL.ITEM_{i}",
+            "item_xid": f"ITEM_{i}",
+            "item_name": f"Item {i}",
+            "domain_name": "INTL",
+            "payload": {"itemXid": f"ITEM_{i}", "itemName": f"Item {i}"}
+        }
+        for i in range(n)
+    ]
+
+
+def count_statements(fn, *args):
+    """Cursor executions made by fn(*args)"""
+    executions = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executions.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn(*args)
+        db.session.flush()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    db.session.rollback()
+    return len(executions)
+
+
+def test_upsert_statement_count_does_not_grow_with_items(items):
+    assert count_statements(upsert_items, records(3)) == count_statements(upsert_items, records(300))
+
+
+def test_upsert_updates_existing_items(items):
+    upsert_items(records(3))
+    db.session.commit()
+
+    rows = db.session.execute(
+        db.select(Item.item_gid, Item.item_name, Item.otm_sync_status).order_by(Item.item_gid)
+    ).all()
+    assert rows == [
+        ("INTL.ITEM_0", "Item 0", "PENDING"),
+        ("INTL.ITEM_1", "Item 1", "PENDING"),
+        ("INTL.ITEM_2", "Item 2", "PENDING"),
+    ]
+    item = db.session.execute(db.select(Item).where(Item.item_gid == "INTL.ITEM_0")).scalar_one()
+    assert item.payload == {"itemXid": "ITEM_0", "itemName": "Item 0"}
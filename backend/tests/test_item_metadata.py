@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from database import db
+from item_modules import item_metadata
+from item_modules.item_metadata import get_item_properties, invalidate_item_metadata
+from models import OtmMetadataCache, OtmObjectMetadata
+
+CATALOG = {
+    "components": {
+        "schemas": {
+            "Item": {"required": ["itemXid"], "properties": {"itemXid": {"type": "string"}, "itemName": {}}},
+            "items": {"properties": {"itemGid": {"type": "string"}}}
+        }
+    }
+}
+
+
+@pytest.fixture
+def otm(app, monkeypatch):
+    app.config.update(
+        OTM_METADATA_URL="https://otm.example/metadata-catalog/items",
+        OTM_LOOKUP_TIMEOUT=5,
+        ITEM_METADATA_TTL_SECONDS=3600,
+        ITEM_METADATA_RETRY_SECONDS=30
+    )
+    for model in (OtmMetadataCache, OtmObjectMetadata):
+        model.__table__.create(db.engine)
+
+    # a fresh process: nothing cached in memory
+    monkeypatch.setattr(item_metadata, "_entry", None)
+    monkeypatch.setattr(item_metadata, "_retry_at", None)
+    monkeypatch.setattr(item_metadata, "_invalidated", False)
+
+    requests = []
+
+    def get(url, headers=None, **kwargs):
+        requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return SimpleNamespace(status_code=304, headers={})
+        return SimpleNamespace(
+            status_code=200,
+            headers={"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"},
+            json=lambda: CATALOG
+        )
+
+    monkeypatch.setattr(item_metadata.otm_client, "get", get)
+    return requests
+
+
+def cache_row():
+    return db.session.execute(db.select(OtmMetadataCache)).scalar_one()
+
+
+def test_download_is_kept_out_of_the_catalog_objects(otm):
+    assert get_item_properties("Item") == {"itemXid": ("string", True), "itemName": (None, False)}
+
+    row = cache_row()
+    assert (row.name, row.etag) == ("item_metadata_catalog", '"v1"')
+    assert db.session.scalar(db.select(db.func.count()).select_from(OtmObjectMetadata)) == 0
+
+
+def test_revalidation_only_moves_checked_at(otm, monkeypatch):
+    get_item_properties("Item")
+    first_check = cache_row().checked_at
+    db.session.expire_all()
+
+    invalidate_item_metadata()
+    assert get_item_properties("items") == {"itemGid": ("string", False)}
+
+    row = cache_row()
+    assert otm[-1]["If-None-Match"] == '"v1"'
+    assert row.checked_at >= first_check
+    assert row.schemas["Item"]["itemXid"] == ["string", True]
+
+
+def test_new_worker_starts_from_the_stored_cache(otm, monkeypatch):
+    get_item_properties("Item")
+    monkeypatch.setattr(item_metadata, "_entry", None)
+
+    assert get_item_properties("Item") == {"itemXid": ("string", True), "itemName": (None, False)}
+    assert len(otm) == 1
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+from item_modules import item_service
+from item_modules.item_service import verify_items_in_otm
+
+ITEM_URL = "https://otm.example/items"
+
+
+@pytest.fixture
+def otm(app, monkeypatch):
+    app.config.update(OTM_ITEM_URL=ITEM_URL, ITEM_VERIFY_CHUNK=100, OTM_LOOKUP_TIMEOUT=5)
+
+    calls = []
+    lookups = {}
+
+    def get(url, params=None, **kwargs):
+        calls.append((url, params))
+        if params is None:
+            return SimpleNamespace(status_code=lookups.get(url, 404))
+
+        listed = [gid for gid in ("D.A", "D.B") if f'"{gid}"' in params["q"]]
+        return SimpleNamespace(
+            status_code=200,
+            json=lambda: {"items": [{"itemGid": gid} for gid in listed]}
+        )
+
+    monkeypatch.setattr(item_service.otm_client, "get", get)
+    return SimpleNamespace(calls=calls, lookups=lookups)
+
+
+def test_quoted_gids_are_looked_up_one_by_one(otm):
+    otm.lookups[ITEM_URL + "/D.Q%22X"] = 200
+
+    found = verify_items_in_otm(["D.A", "D.B", 'D.Q"X', "D.S\\X", "D.Z"])
+
+    assert found == {"D.A", "D.B", 'D.Q"X'}
+
+    queries = [params["q"] for _, params in otm.calls if params]
+    assert queries == ['itemGid in ("D.A","D.B","D.Z")']
+
+
+def test_failed_lookup_raises(otm):
+    otm.lookups[ITEM_URL + "/D.Q%22X"] = 500
+
+    with pytest.raises(RuntimeError):
+        verify_items_in_otm(["D.A", 'D.Q"X'])
@@ -0,0 +1,54 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from json_provider import OrjsonProvider
+
+
+@pytest.fixture
+def provider(app):
+    app.json = OrjsonProvider(app)
+    return app.json
+
+
+def test_numpy_values_are_serialized(provider):
+    doc = {
+        "int": np.int64(3),
+        "float": np.float64(1.5),
+        "flag": np.bool_(True),
+        "half": np.float16(0.5),
+        "array": np.array([1, 2]),
+        "objects": np.array(["a", None], dtype=object)
+    }
+
+    expected = {
+        "int": 3, "float": 1.5, "flag": True, "half": 0.5,
+        "array": [1, 2], "objects": ["a", None]
+    }
+    assert json.loads(provider.dumps(doc)) == expected
+    assert provider.response(doc).get_json() == expected
+
+
+def test_matches_default_provider_output(provider):
+    doc = {"b": Decimal("1.25"), "a": date(2026, 1, 2), "n": None}
+
+    assert json.loads(provider.dumps(doc)) == {"b": "1.25", "a": "Fri, 02 Jan 2026 00:00:00 GMT", "n": None}
+    assert list(provider.response(doc).get_json()) == ["b", "a", "n"]
+
+
+@pytest.mark.parametrize("args, kwargs, expected", [
+    ((), {}, None),
+    (([1, 2],), {}, [1, 2]),
+    ((1, 2), {}, [1, 2]),
+    ((), {"a": 1}, {"a": 1}),
+])
+def test_response_args(provider, args, kwargs, expected):
+    assert provider.response(*args, **kwargs).get_json() == expected
+
+
+def test_response_rejects_args_and_kwargs(provider):
+    with pytest.raises(TypeError):
+        provider.response(1, a=2)
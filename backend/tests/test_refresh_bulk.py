@@ -0,0 +1,28 @@
+import pytest
+
+from config import Config
+from routes import bp
+
+
+@pytest.fixture
+def client(app):
+    app.config["REFRESH_BULK_LIMIT"] = Config.REFRESH_BULK_LIMIT
+    app.register_blueprint(bp, url_prefix="/api")
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body", [
+    {"ids": ["a"]},
+    {"ids": "12"},
+    {"ids": ["12"]},
+    {"ids": [1.5]},
+    {"ids": [True]},
+    {"ids": {"1": 1}},
+    {"status": "RECEIVED", "limit": "ten"},
+    {"status": "RECEIVED", "limit": -1},
+])
+def test_invalid_body_is_rejected(client, body):
+    response = client.post("/api/refresh", json=body)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
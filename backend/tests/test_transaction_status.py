@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+import otm_service
+import status_refresh
+from otm_service import get_otm_transaction_status, transaction_at
+
+# rows as sql2xml may return them: not in I_TRANSACTION_NO order, and
+# with numbers of different lengths (string order would put 1000 first)
+TRANSACTIONS = [("1000", "ERROR"), ("998", "PROCESSED"), ("999", "PROCESSED")]
+
+
+def dbxml_response(rows):
+    body = "".join(
+        f'<I_TRANSACTION I_TRANSACTION_NO="{no}" STATUS="{status}"/>'
+        for no, status in rows
+    )
+    return f"<sql2xml><I_TRANSACTION_ROOT>{body}</I_TRANSACTION_ROOT></sql2xml>"
+
+
+@pytest.mark.parametrize("seq, expected", [
+    (1, ("998", "PROCESSED")),
+    (2, ("999", "PROCESSED")),
+    (3, ("1000", "ERROR")),
+    (4, None),
+])
+def test_transaction_at_follows_transaction_numbers(seq, expected):
+    assert transaction_at(TRANSACTIONS, seq) == expected
+
+
+def test_transaction_status_matches_element_position(monkeypatch):
+    monkeypatch.setattr(
+        otm_service.otm_client, "post",
+        lambda *args, **kwargs: SimpleNamespace(text=dbxml_response(TRANSACTIONS))
+    )
+
+    assert get_otm_transaction_status(903004, 3) == ("ERROR", "1000")
+    assert get_otm_transaction_status(903004, 1) == ("PROCESSED", "998")
+
+
+def test_transaction_status_falls_back_to_transmission(monkeypatch):
+    monkeypatch.setattr(
+        otm_service.otm_client, "post",
+        lambda *args, **kwargs: SimpleNamespace(text=dbxml_response(TRANSACTIONS[:1]))
+    )
+    monkeypatch.setattr(otm_service, "get_otm_status", lambda no: "PROCESSING")
+
+    assert get_otm_transaction_status(903004, 2) == ("PROCESSING", None)
+
+
+def test_bulk_refresh_matches_element_position(monkeypatch):
+    monkeypatch.setattr(status_refresh, "get_otm_statuses", lambda nos: {903004: "PROCESSED"})
+    monkeypatch.setattr(
+        status_refresh, "get_otm_transaction_statuses", lambda nos: {903004: list(TRANSACTIONS)}
+    )
+    monkeypatch.setattr(
+        status_refresh, "get_transmission_error_reports",
+        lambda nos: {903004: [("998", "A : first"), ("1000", "B : third")]}
+    )
+
+    invoices = [
+        SimpleNamespace(
+            id=seq, transmission_no="903004", transmission_seq=seq,
+            source_type="XML", status="RECEIVED", error_message=None
+        )
+        for seq in (1, 2, 3)
+    ]
+
+    status_refresh.refresh_invoices(invoices)
+
+    assert [inv.status for inv in invoices] == ["PROCESSED", "PROCESSED", "ERROR"]
+    assert invoices[2].error_message == "B : third"
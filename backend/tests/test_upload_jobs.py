@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import db
+from models import UploadJob
+from upload_jobs import run_pending_jobs
+
+
+@pytest.fixture
+def jobs(app):
+    app.config["UPLOAD_JOB_STALE_SECONDS"] = 600
+    UploadJob.__table__.create(db.engine)
+
+    now = datetime.utcnow()
+    db.session.add_all([
+        UploadJob(id=1, status="RUNNING", process_type="xml", file_data=b"x",
+                  started_at=now - timedelta(hours=2), updated_at=now - timedelta(hours=1)),
+        UploadJob(id=2, status="RUNNING", process_type="xml", file_data=b"x",
+                  started_at=now - timedelta(minutes=5), updated_at=now - timedelta(seconds=30)),
+        UploadJob(id=3, status="DONE", process_type="xml",
+                  started_at=now - timedelta(hours=2), updated_at=now - timedelta(hours=1)),
+    ])
+    db.session.commit()
+
+
+def test_stale_running_job_is_failed(jobs):
+    assert run_pending_jobs() == 0
+
+    statuses = dict(db.session.execute(db.select(UploadJob.id, UploadJob.status)).all())
+    assert statuses == {1: "FAILED", 2: "RUNNING", 3: "DONE"}
+
+    stale = db.session.get(UploadJob, 1)
+    assert stale.error_message and stale.finished_at and stale.file_data is None
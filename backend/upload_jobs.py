@@ -0,0 +1,212 @@
+"""
+Background processing for queued Excel uploads.
+
+POST /api/invoice/upload with async=true stores the file in upload_jobs
+and returns at once; workers claim jobs with SELECT ... FOR UPDATE SKIP
+LOCKED, so any number of threads or processes can share the queue.
+A job whose worker died (no progress for UPLOAD_JOB_STALE_SECONDS) is
+marked FAILED by the next worker that looks for work.
+
+Run a standalone worker process with:
+    python upload_jobs.py
+"""
+import io
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from database import db
+from models import UploadJob
+from upload_service import process_xml_upload, process_json_upload
+from template_store import get_template
+
+
+# ============================================================
+# STALE JOBS
+# ============================================================
+def fail_stale_jobs():
+    """
+    RUNNING jobs whose updated_at (refreshed by the progress reporter)
+    is older than UPLOAD_JOB_STALE_SECONDS lost their worker. They are
+    failed rather than rerun: some of their invoices may already be in
+    OTM, and none of their rows were committed.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=current_app.config["UPLOAD_JOB_STALE_SECONDS"])
+
+    result = db.session.execute(
+        db.update(UploadJob)
+        .where(UploadJob.status == "RUNNING", UploadJob.updated_at < cutoff)
+        .values(
+            status="FAILED",
+            error_message="Upload worker stopped before the job finished",
+            file_data=None,
+            finished_at=now,
+            updated_at=now
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+# ============================================================
+# CLAIM NEXT JOB
+# ============================================================
+def claim_next_job():
+    stmt = (
+        db.select(UploadJob)
+        .where(UploadJob.status == "QUEUED")
+        .order_by(UploadJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+
+    job = db.session.execute(stmt).scalar_one_or_none()
+
+    if job is None:
+        db.session.rollback()
+        return None
+
+    job.status = "RUNNING"
+    job.started_at = job.updated_at = datetime.utcnow()
+    db.session.commit()
+
+    return job
+
+
+# ============================================================
+# PROGRESS (OWN CONNECTION)
+# ============================================================
+def progress_reporter(job_id, every_seconds=1.0):
+    """
+    Writes counters through a separate connection so /api/jobs/<id> sees
+    them while the job's invoices are still in one open transaction.
+    """
+    last = [0.0]
+
+    def report(done, failed):
+        now = time.monotonic()
+        if now - last[0] < every_seconds:
+            return
+        last[0] = now
+
+        with db.engine.begin() as conn:
+            conn.execute(
+                db.update(UploadJob)
+                .where(UploadJob.id == job_id)
+                .values(
+                    invoices_done=done,
+                    invoices_failed=failed,
+                    updated_at=datetime.utcnow()
+                )
+            )
+
+    return report
+
+
+# ============================================================
+# RUN ONE JOB
+# ============================================================
+def run_job(job):
+    job_id = job.id
+    file = io.BytesIO(job.file_data)
+    progress = progress_reporter(job_id)
+
+    try:
+        template = get_template(job.template_id) if job.template_id else None
+        if job.template_id and template is None:
+            raise ValueError("Template not found")
+        mapping = template["mapping"] if template else None
+
+        if job.process_type == "xml":
+            result = process_xml_upload(
+                file,
+                streaming=job.streaming,
+                progress=progress,
+                field_mapping=mapping
+            )
+        else:
+            result = process_json_upload(file, progress=progress, field_mapping=mapping)
+
+        job.status = "DONE"
+        job.result = result
+        job.invoices_done = result.get("count", 1)
+        job.invoices_failed = result.get("failed", 0)
+        job.file_data = None
+
+    except Exception as e:
+        logging.exception(f"Upload job {job_id} failed")
+        db.session.rollback()
+
+        job = db.session.get(UploadJob, job_id)
+        job.status = "FAILED"
+        job.error_message = str(e)
+
+    job.finished_at = job.updated_at = datetime.utcnow()
+
+    # invoices and the job outcome land in the same commit
+    db.session.commit()
+
+
+def run_pending_jobs():
+    """Processes queued jobs until none are left; returns how many ran"""
+    stale = fail_stale_jobs()
+    if stale:
+        logging.warning(f"Failed {stale} upload job(s) left RUNNING by a stopped worker")
+
+    count = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return count
+        run_job(job)
+        count += 1
+
+
+# ============================================================
+# WORKER LOOP
+# ============================================================
+def worker_loop(app, poll_seconds):
+    while True:
+        with app.app_context():
+            try:
+                ran = run_pending_jobs()
+            except Exception:
+                logging.exception("Upload job worker error")
+                db.session.rollback()
+                ran = 0
+            finally:
+                db.session.remove()
+
+        if not ran:
+            time.sleep(poll_seconds)
+
+
+def start_job_workers(app):
+    """Starts UPLOAD_JOB_WORKERS daemon threads polling the job table"""
+    workers = app.config.get("UPLOAD_JOB_WORKERS", 2)
+    poll_seconds = app.config.get("UPLOAD_JOB_POLL_SECONDS", 2)
+
+    threads = []
+    for i in range(workers):
+        t = threading.Thread(
+            target=worker_loop,
+            args=(app, poll_seconds),
+            name=f"upload-job-worker-{i}",
+            daemon=True
+        )
+        t.start()
+        threads.append(t)
+
+    return threads
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO)
+    print("🛠️ Upload job worker started")
+    worker_loop(app, app.config.get("UPLOAD_JOB_POLL_SECONDS", 2))
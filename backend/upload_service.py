@@ -0,0 +1,308 @@
+import json
+from copy import deepcopy
+from itertools import groupby
+
+import pandas as pd
+from flask import current_app
+
+from database import db
+from models import Invoice
+from payload_store import stage_payload, flush_payloads
+
+from xml_builder import (
+    build_invoice_element,
+    build_transmission_xml,
+    normalize_invoice_dates,
+    pack_transmissions,
+    resolve_column,
+    stream_invoice_xml,
+    xml_text
+)
+from json_builder import build_invoice_json_from_dataframe
+from excel_stream import iter_invoice_groups
+from task_pool import map_in_order
+
+from otm_service import post_to_otm
+from otm_rest_service import post_excel_json_invoice_to_otm
+
+
+# ============================================================
+# EXCEL → XML → OTM (MULTI-INVOICE)
+# ============================================================
+# Shared by the synchronous /invoice/upload route and the background
+# upload job workers. Invoice rows are added to the session but not
+# committed; the caller commits once it has recorded the outcome.
+def process_xml_upload(file, streaming=False, progress=None, field_mapping=None):
+    """
+    progress, when given, is called as progress(done, failed) after every
+    invoice outcome. field_mapping is a template's field id -> column
+    mapping (template_store); unmapped fields use the default columns.
+    """
+
+    if streaming:
+        # invoices are built as soon as their rows end, so memory
+        # follows the largest invoice instead of the whole file
+        id_columns = [c for c in ((field_mapping or {}).get("invoiceXid"), "INVOICE_XID") if c]
+        grouped = iter_invoice_groups(file, id_columns)
+        flush_every = current_app.config.get("EXCEL_STREAM_FLUSH_EVERY", 50)
+        date_fallbacks = 0
+    else:
+        df = pd.read_excel(file)
+        # whole date column parsed once instead of per invoice
+        df, date_fallbacks = normalize_invoice_dates(df, field_mapping)
+        id_column = resolve_column(df, field_mapping, "invoiceXid", "INVOICE_XID")
+        if id_column is None:
+            raise ValueError("Column 'INVOICE_XID' not found in Excel sheet")
+        grouped = df.groupby(id_column)
+
+    pack_size = current_app.config.get("OTM_PACK_INVOICES", 1)
+    pack_bytes = current_app.config.get("OTM_PACK_MAX_BYTES")
+    # packing reuses the element trees, so only unpacked invoices stream
+    stream_min_lines = current_app.config.get("XML_STREAM_MIN_LINES")
+    if pack_size != 1:
+        stream_min_lines = None
+
+    def invoice_number(invoice_df):
+        num_column = resolve_column(invoice_df, field_mapping, "invoiceNumber", "INVOICE_NUM")
+        return str(invoice_df.iloc[0][num_column]) if num_column else "MISSING"
+
+    def build_payload(invoice_xid, invoice_df):
+        nonlocal date_fallbacks
+        if streaming:
+            invoice_df, fallbacks = normalize_invoice_dates(invoice_df, field_mapping)
+            date_fallbacks += fallbacks
+        invoice_num = invoice_number(invoice_df)
+        if stream_min_lines and len(invoice_df) >= stream_min_lines:
+            # written straight to bytes, no tree held in memory
+            xml_bytes = stream_invoice_xml(invoice_df, field_mapping)
+            return invoice_xid, invoice_num, xml_bytes, xml_text(xml_bytes), None, None
+        element = build_invoice_element(invoice_df, field_mapping)
+        # standalone copy is what gets stored, viewed and resent
+        xml_bytes, xml_string = build_transmission_xml([element])
+        return invoice_xid, invoice_num, xml_bytes, xml_string, element, None
+
+    def build_payloads():
+        """
+        (invoice_xid, invoice_num, xml_bytes, xml_string, element, error);
+        an invoice that cannot be built carries its error and no XML
+        """
+        for invoice_xid, invoice_df in grouped:
+            try:
+                yield build_payload(invoice_xid, invoice_df)
+            except Exception as ex:
+                yield invoice_xid, invoice_number(invoice_df), None, None, None, ex
+
+    def build_transmissions():
+        """(batch, xml_bytes, error); failed invoices go out alone, unsent"""
+        runs = groupby(build_payloads(), key=lambda payload: payload[5] is not None)
+        for failed, payloads in runs:
+            if failed:
+                for payload in payloads:
+                    yield [payload], None, payload[5]
+                continue
+
+            # up to OTM_PACK_INVOICES invoices share one Transmission
+            batches = pack_transmissions(
+                payloads,
+                max_invoices=pack_size,
+                max_bytes=pack_bytes,
+                size=lambda payload: len(payload[2])
+            )
+            for batch in batches:
+                if len(batch) == 1:
+                    yield batch, batch[0][2], None
+                    continue
+                try:
+                    xml_bytes, _ = build_transmission_xml(
+                        [deepcopy(payload[4]) for payload in batch],
+                        with_text=False
+                    )
+                except Exception as ex:
+                    yield batch, None, ex
+                    continue
+                yield batch, xml_bytes, None
+
+    def submit(transmission):
+        _, xml_bytes, build_error = transmission
+        if build_error is not None:
+            raise build_error
+        return post_to_otm(xml_bytes)
+
+    # OTM calls run on a bounded pool; outcomes come back in file order.
+    # Build errors come back as the error of their invoices, so one bad
+    # invoice cannot abort an upload whose earlier invoices were posted.
+    submissions = map_in_order(
+        submit,
+        build_transmissions(),
+        max_workers=current_app.config.get("OTM_SUBMIT_WORKERS", 4)
+    )
+
+    results = []
+    pending = []
+    transmissions = 0
+    failed = 0
+
+    for (batch, xml_bytes, _), otm_result, error in submissions:
+        response_xml, transmission_no = otm_result or (None, None)
+        if xml_bytes is not None:
+            transmissions += 1
+
+        for seq, payload in enumerate(batch, start=1):
+            invoice_xid, invoice_num, _, xml_string, _, _ = payload
+
+            invoice = Invoice(
+                invoice_xid=invoice_xid,
+                invoice_num=invoice_num,
+                transmission_no=transmission_no,
+                # element position; see otm_service.transaction_at
+                transmission_seq=seq if len(batch) > 1 else None,
+                status="ERROR" if error else "RECEIVED",
+
+                request_xml=xml_string,
+                request_json=None,
+
+                response_xml=response_xml,
+                error_message=str(error) if error else None,
+
+                source_type="XML"
+            )
+
+            pending.append(invoice)
+
+            results.append({
+                "invoiceXid": invoice_xid,
+                "invoiceNumber": invoice_num,
+                "transmission_no": transmission_no,
+                "status": invoice.status,
+                "error": invoice.error_message
+            })
+
+            if error:
+                failed += 1
+            if progress:
+                progress(len(results), failed)
+
+        # push pending rows out so their XML can be released;
+        # still one transaction, committed by the caller
+        if streaming and len(pending) >= flush_every:
+            db.session.add_all(pending)
+            db.session.flush()
+            pending = []
+
+    db.session.add_all(pending)
+
+    return {
+        "message": "Invoices created using XML",
+        "count": len(results),
+        "transmissions": transmissions,
+        "failed": failed,
+        # rows whose INVOICE_DATE was blank or unreadable (current time used)
+        "date_fallbacks": date_fallbacks,
+        "invoices": results
+    }
+
+
+# ============================================================
+# EXCEL → JSON → OTM (MULTI-INVOICE)
+# ============================================================
+# One payload per invoice id (the mapped invoiceXid column, INVOICE_XID
+# by default); a sheet without that column is a single invoice, as
+# before. Payloads are posted on the OTM_SUBMIT_WORKERS pool and all
+# invoice rows are written at the end in one bulk INSERT (executemany).
+# Nothing is committed here.
+def iter_json_payloads(df, field_mapping=None):
+    print("📊 EXCEL/DF COLUMNS:", df.columns.tolist())
+
+    id_col = resolve_column(df, field_mapping, "invoiceXid", "INVOICE_XID")
+    if id_col is None:
+        groups = [df]
+    else:
+        # file order; rows without an id still form one invoice
+        groups = (g for _, g in df.groupby(id_col, sort=False, dropna=False))
+
+    for invoice_df in groups:
+        # lineitemSeqNo restarts at 1 for every invoice
+        yield build_invoice_json_from_dataframe(
+            invoice_df.reset_index(drop=True), field_mapping
+        )
+
+
+def process_json_invoices(df, field_mapping=None, progress=None):
+    """
+    progress, when given, is called as progress(done, failed) after every
+    invoice outcome.
+    """
+
+    submissions = map_in_order(
+        post_excel_json_invoice_to_otm,
+        iter_json_payloads(df, field_mapping),
+        max_workers=current_app.config.get("OTM_SUBMIT_WORKERS", 4)
+    )
+
+    pending = []
+    results = []
+    failed = 0
+
+    for payload, otm_response, error in submissions:
+        transmission_no = None if error else (
+            otm_response.get("transmissionNo")
+            or otm_response.get("id")
+        )
+
+        invoice = {
+            "invoice_xid": payload["invoiceXid"],
+            "invoice_num": payload["invoiceNumber"],
+            "transmission_no": transmission_no,
+            "status": "ERROR" if error else "RECEIVED",
+
+            # bodies go to payload_archive, the row keeps their hashes
+            "request_json_hash": stage_payload("json", payload),
+            "response_xml_hash": None if error else stage_payload("xml", json.dumps(otm_response)),
+            "error_message": str(error) if error else None,
+
+            "source_type": "JSON"
+        }
+
+        pending.append(invoice)
+
+        results.append({
+            "invoiceXid": invoice["invoice_xid"],
+            "invoiceNumber": invoice["invoice_num"],
+            "transmission_no": transmission_no,
+            "status": invoice["status"],
+            "error": invoice["error_message"]
+        })
+
+        if error:
+            failed += 1
+        if progress:
+            progress(len(results), failed)
+
+    if pending:
+        flush_payloads(db.session)
+        # render_nulls: every row has the same columns, so one executemany
+        db.session.execute(
+            db.insert(Invoice).execution_options(render_nulls=True),
+            pending
+        )
+
+    summary = {
+        "message": "Invoices created using JSON",
+        "count": len(results),
+        "failed": failed,
+        "invoices": results
+    }
+
+    # single-invoice uploads keep their old top-level fields
+    if len(results) == 1:
+        summary.update({
+            key: results[0][key]
+            for key in ("invoiceXid", "invoiceNumber", "transmission_no")
+        })
+
+    return summary
+
+
+def process_json_upload(file, progress=None, field_mapping=None):
+    df = pd.read_excel(file)
+    return process_json_invoices(df, field_mapping=field_mapping, progress=progress)
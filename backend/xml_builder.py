@@ -1,33 +1,171 @@
+import io
+import os
+from contextlib import contextmanager
+from copy import deepcopy
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from lxml import etree
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 from dateutil import parser as date_parser
 
 NS = "http://xmlns.oracle.com/apps/otm/transmission/v6.4"
 
 
-def to_glog_date(value):
-    if not value or str(value).strip().lower() in ["none", "missing", ""]:
-        return datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+# ============================================================
+# DATES
+# ============================================================
+GLOG_DATE_FORMAT = "%Y%m%d%H%M%S"
+
+# Day-first layouts tried on a whole column; dateutil (dayfirst=True)
+# reads each of them the same way, so a match gives the same date
+DATE_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%d/%m/%Y %H:%M", "%d-%m-%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S", "%d-%m-%Y %H:%M:%S",
+    "%d-%b-%Y", "%d %b %Y",
+]
+DATE_SAMPLE_SIZE = 50
+
+# distinct strings that need dateutil, kept across uploads
+DATE_MEMO_SIZE = 4096
+
+
+def now_glog_date():
+    return datetime.now(UTC).strftime(GLOG_DATE_FORMAT)
+
+
+def is_blank_date(value):
+    if value is None or value is pd.NaT or value is pd.NA:
+        return True
+    if isinstance(value, float) and np.isnan(value):
+        return True
+    return not value or str(value).strip().lower() in ["none", "missing", ""]
+
+
+@lru_cache(maxsize=DATE_MEMO_SIZE)
+def parse_date_text(text):
+    """dateutil parse (day first) of one string, tz dropped; None when it fails"""
     try:
-        dt = date_parser.parse(str(value), dayfirst=True)
-        return dt.strftime("%Y%m%d%H%M%S")
+        return date_parser.parse(text, dayfirst=True).replace(tzinfo=None)
     except Exception:
+        return None
+
+
+def to_glog_date(value):
+    # real dates (Excel date cells) need no parsing, and no day/month guess
+    if isinstance(value, (datetime, date)) and not is_blank_date(value):
+        return value.strftime(GLOG_DATE_FORMAT)
+    if is_blank_date(value):
+        return now_glog_date()
+
+    dt = parse_date_text(str(value))
+    if dt is None:
         print(f"⚠️ Failed to parse date: {value}. Using current time.")
-        return datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+        return now_glog_date()
+    return dt.strftime(GLOG_DATE_FORMAT)
+
+
+def detect_date_format(strings):
+    """The DATE_FORMATS entry matching most of a sample, checked against dateutil"""
+    sample = pd.Series(strings[:DATE_SAMPLE_SIZE], dtype=object)
+    best, best_hits = None, 0
+
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        matched = parsed.notna()
+        hits = int(matched.sum())
+        if hits <= best_hits:
+            continue
+        if all(parse_date_text(text) == ts for text, ts in zip(sample[matched], parsed[matched])):
+            best, best_hits = fmt, hits
+
+    return best
+
+
+def normalize_dates(values):
+    """
+    Parses a whole date column at once. Returns (dates, fallbacks): dates
+    is a datetime64 Series, NaT where the value is blank or unparseable
+    (the builders then use the current time); fallbacks counts those NaTs.
+
+    Each distinct value is parsed once: strings in the column's dominant
+    day-first layout by one pd.to_datetime call, the rest through the
+    memoized dateutil parser.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, int(values.isna().sum())
+
+    codes, distinct = pd.factorize(values)
+    distinct = [None if is_blank_date(v) else v for v in distinct]
+
+    strings = [v for v in distinct if isinstance(v, str)]
+    by_format = {}
+    fmt = detect_date_format(strings) if strings else None
+    if fmt:
+        converted = pd.to_datetime(pd.Series(strings, dtype=object), format=fmt, errors="coerce")
+        by_format = {
+            text: ts for text, ts in zip(strings, converted) if ts is not pd.NaT
+        }
+
+    parsed = []
+    unparsed = []
+    for value in distinct:
+        if value is None:
+            dt = None
+        elif value in by_format:
+            dt = by_format[value]
+        elif isinstance(value, (datetime, date)):
+            dt = value
+        else:
+            dt = parse_date_text(str(value))
+            if dt is None:
+                unparsed.append(value)
+        parsed.append(pd.NaT if dt is None else dt)
+
+    if unparsed:
+        print(f"⚠️ Failed to parse dates: {unparsed[:5]}. Using current time.")
+
+    # NaN/None values have code -1, i.e. the trailing NaT
+    lookup = pd.DatetimeIndex(pd.to_datetime(parsed + [pd.NaT]))
+    dates = pd.Series(lookup.take(codes), index=values.index)
+    return dates, int(dates.isna().sum())
+
+
+def normalize_invoice_dates(df, field_mapping=None):
+    """normalize_dates() on the invoice date column; returns (df copy, fallbacks)"""
+    col_name = resolve_column(df, field_mapping, "invoiceDate", "INVOICE_DATE")
+    if col_name is None or df.empty:
+        return df, 0
+
+    dates, fallbacks = normalize_dates(df[col_name])
+    df = df.copy()
+    df[col_name] = dates
+    return df, fallbacks
+
+
+def clean(text):
+    # Filter out obvious place holders
+    clean_text = str(text)
+    if clean_text.lower() in ["none", "missing"]:
+        clean_text = ""
+    return clean_text
+
 
 def e(parent, tag, text=None):
     el = etree.SubElement(parent, f"{{{NS}}}{tag}")
     if text is not None:
-        # Filter out obvious place holders
-        clean_text = str(text)
-        if clean_text.lower() in ["none", "missing"]:
-            clean_text = ""
-        el.text = clean_text
+        el.text = clean(text)
     return el
 
 
-def build_invoice_xml(invoice_rows, field_mapping=None):
+def build_invoice_xml_rowwise(invoice_rows, field_mapping=None):
+    """
+    Original row-by-row builder. Kept as the reference output for
+    build_invoice_xml and for bench_xml_builder.py.
+    """
     df = invoice_rows
     if df.empty:
         raise ValueError("Cannot build XML from empty dataframe")
@@ -159,3 +297,465 @@ def build_invoice_xml(invoice_rows, field_mapping=None):
     xml_string = etree.tostring(root, pretty_print=True, encoding="unicode")
 
     return xml_bytes, xml_string
+
+
+
+# ============================================================
+# COLUMNAR FAST PATH
+# ============================================================
+HEADER_FIELDS = {
+    "domainName": "DOMAIN",
+    "invoiceXid": "INVOICE_XID",
+    "invoiceNumber": "INVOICE_NUM",
+    "invoiceDate": "INVOICE_DATE",
+    "serviceProvider": "SERVICE_PROVIDER",
+    "currencyGid": "CURRENCY",
+}
+
+LINE_FIELDS = {
+    "shipmentGid": "SHIPMENT_GID",
+    "costTypeGid": "COST_TYPE",
+    "currencyGid": "CURRENCY",
+    "amount": "AMOUNT",
+}
+
+
+def resolve_column(df, field_mapping, field_id, default_col):
+    """Same lookup rule as get_val(), done once per DataFrame"""
+    col_name = field_mapping.get(field_id) if field_mapping else default_col
+    if not col_name or col_name not in df.columns:
+        col_name = default_col
+    return col_name if col_name in df.columns else None
+
+
+def join_list(val):
+    return "; ".join([str(v) for v in val if str(v).strip()])
+
+
+def column_values(df, col_name, dtype):
+    """
+    Column as a NumPy array in the DataFrame's interleaved dtype, which is
+    what iterrows() hands to get_val (e.g. ints become floats when every
+    column is numeric).
+    """
+    if col_name is None:
+        return None
+    return df[col_name].to_numpy(dtype=dtype)
+
+
+def column_strings(values, length):
+    if values is None:
+        return [""] * length
+
+    # one vectorized null check; lists are never flagged as missing
+    missing = pd.isna(values).tolist()
+    return [
+        "" if miss else join_list(v) if isinstance(v, list) else str(v)
+        for v, miss in zip(values, missing)
+    ]
+
+
+def parse_amounts(df, col_name, values, strings):
+    """float(get_val(...) or "0") for the whole column, 0.0 on bad input"""
+    if values is None:
+        return np.zeros(len(df))
+
+    dtype = df[col_name].dtype
+    if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        # str() -> float() round-trips exactly, so skip the text step
+        amounts = values.astype(float)
+        amounts[pd.isna(values)] = 0.0
+        return amounts
+
+    amounts = np.empty(len(strings))
+    for i, text in enumerate(strings):
+        try:
+            amounts[i] = float(text or "0")
+        except ValueError:
+            amounts[i] = 0.0
+    return amounts
+
+
+def build_line_item(gd, line_no, shipment_gid, cost_type, currency, amount):
+    """
+    Emits one GenericLineItem and returns it with the iter() positions of
+    its variable nodes, so it can be reused as a copy template.
+    """
+    gli = e(gd, "GenericLineItem")
+    num = e(gli, "AssignedNum", str(line_no))
+
+    lir = e(gli, "LineItemRefNum")
+    ref = e(lir, "LineItemRefNumValue", shipment_gid)
+    lirq = e(lir, "LineItemRefNumQualifierGid")
+    lirqg = e(lirq, "Gid")
+    e(lirqg, "Xid", "GLOG")
+
+    cile = e(gli, "CommonInvoiceLineElements")
+    com = e(cile, "Commodity")
+    desc = e(com, "Description", cost_type)
+
+    fr = e(cile, "FreightRate")
+    fc = e(fr, "FreightCharge")
+    fa = e(fc, "FinancialAmount")
+    cur = e(fa, "GlobalCurrencyCode", currency)
+    amt = e(fa, "MonetaryAmount", amount)
+    e(fa, "RateToBase", "1.0")
+    e(fa, "FuncCurrencyAmount", "0.0")
+
+    ctg = e(gli, "CostTypeGid")
+    ctgid = e(ctg, "Gid")
+    ctx = e(ctgid, "Xid", cost_type)
+
+    nodes = list(gli.iter())
+    slots = [nodes.index(n) for n in (num, ref, desc, cur, amt, ctx)]
+    return gli, slots
+
+
+def invoice_plan(invoice_rows, field_mapping=None):
+    """
+    Column plan shared by the tree and the streaming builders: header
+    texts, per-line texts and amounts, and the invoice total.
+    """
+    df = invoice_rows
+    if df.empty:
+        raise ValueError("Cannot build XML from empty dataframe")
+
+    n = len(df)
+    dtype = df.iloc[:1].to_numpy().dtype
+
+    # ---------- COLUMN PLAN (resolved once) ----------
+    head = {}
+    for field_id, default_col in HEADER_FIELDS.items():
+        col_name = resolve_column(df, field_mapping, field_id, default_col)
+        values = column_values(df.iloc[:1], col_name, dtype)
+        head[field_id] = column_strings(values, 1)[0]
+
+    lines = {}
+    for field_id, default_col in LINE_FIELDS.items():
+        col_name = resolve_column(df, field_mapping, field_id, default_col)
+        values = column_values(df, col_name, dtype)
+        lines[field_id] = column_strings(values, n)
+        if field_id == "amount":
+            amounts = parse_amounts(df, col_name, values, lines[field_id])
+
+    # sequential sum (same rounding as the row loop), leading 0.0 keeps -0.0 out
+    total_amount = float(np.cumsum(np.concatenate(([0.0], amounts)))[-1])
+
+    # date cells are formatted as they are, anything else is parsed as text
+    date_col = resolve_column(df, field_mapping, "invoiceDate", "INVOICE_DATE")
+    raw_date = df[date_col].iloc[0] if date_col else None
+    if not isinstance(raw_date, (datetime, date)):
+        raw_date = head["invoiceDate"]
+    head["invoiceDate"] = to_glog_date(raw_date)
+
+    head["domainName"] = head["domainName"] or "INTL"
+    head["currencyGid"] = head["currencyGid"] or "INR"
+
+    rows = zip(
+        lines["shipmentGid"],
+        lines["costTypeGid"],
+        [c or "INR" for c in lines["currencyGid"]],
+        [f"{a:.4f}" for a in amounts.tolist()]
+    )
+
+    return head, rows, total_amount
+
+
+def build_invoice_element(invoice_rows, field_mapping=None):
+    """Builds the <GLogXMLElement> for one invoice, detached from any Transmission"""
+    head, rows, total_amount = invoice_plan(invoice_rows, field_mapping)
+
+    domain = head["domainName"]
+    currency = head["currencyGid"]
+
+    gx = etree.Element(f"{{{NS}}}GLogXMLElement", nsmap={"otm": NS})
+    invoice = e(gx, "Invoice")
+    payment = e(invoice, "Payment")
+
+    # ---------- PAYMENT HEADER ----------
+    ph = e(payment, "PaymentHeader")
+    e(ph, "DomainName", domain)
+
+    ig = e(ph, "InvoiceGid")
+    gid = e(ig, "Gid")
+    e(gid, "DomainName", domain)
+    e(gid, "Xid", head["invoiceXid"])
+
+    e(ph, "TransactionCode", "IU")
+    e(ph, "InvoiceNum", head["invoiceNumber"])
+
+    inv_date = e(ph, "InvoiceDate")
+    e(inv_date, "GLogDate", head["invoiceDate"])
+    e(inv_date, "TZId", "UTC")
+    e(inv_date, "TZOffset", "+00:00")
+
+    ref = e(ph, "InvoiceRefnum")
+    rq = e(ref, "InvoiceRefnumQualifierGid")
+    rqg = e(rq, "Gid")
+    e(rqg, "Xid", "BM")
+    e(ref, "InvoiceRefnumValue", head["invoiceNumber"])
+
+    spg = e(ph, "ServiceProviderGid")
+    spgid = e(spg, "Gid")
+    e(spgid, "DomainName", domain)
+    e(spgid, "Xid", head["serviceProvider"])
+
+    spal = e(ph, "ServiceProviderAlias")
+    spalq = e(spal, "ServiceProviderAliasQualifierGid")
+    spalqg = e(spalq, "Gid")
+    e(spalqg, "Xid", "GLOG")
+    e(spal, "ServiceProviderAliasValue", f"{domain}.{head['serviceProvider']}")
+
+    e(ph, "GlobalCurrencyCode", currency)
+
+    # ---------- LINE ITEMS ----------
+    pmd = e(payment, "PaymentModeDetail")
+    gd = e(pmd, "GenericDetail")
+
+    # Line 1 is built element by element and doubles as the template:
+    # later lines are deep copies with only the variable texts replaced,
+    # which is several times cheaper than ~20 SubElement calls per line.
+    template = None
+
+    for line_no, (shipment_gid, cost_type, line_currency, amount) in enumerate(rows, start=1):
+        if template is None:
+            template, slots = build_line_item(
+                gd, line_no, shipment_gid, cost_type, line_currency, amount
+            )
+            at_num, at_ref, at_desc, at_cur, at_amt, at_ctx = slots
+            continue
+
+        gli = deepcopy(template)
+        nodes = list(gli.iter())
+        nodes[at_num].text = str(line_no)
+        nodes[at_ref].text = clean(shipment_gid)
+        nodes[at_desc].text = nodes[at_ctx].text = clean(cost_type)
+        nodes[at_cur].text = clean(line_currency)
+        nodes[at_amt].text = amount
+        gd.append(gli)
+
+    # ---------- SUMMARY ----------
+    ps = e(payment, "PaymentSummary")
+    psfc = e(ps, "FreightCharge")
+    psfa = e(psfc, "FinancialAmount")
+    e(psfa, "GlobalCurrencyCode", currency)
+    e(psfa, "MonetaryAmount", f"{total_amount:.4f}")
+    e(ps, "InvoiceTotal", "1")
+
+    return gx
+
+
+XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8'?>\n"
+
+
+def xml_text(xml_bytes):
+    """
+    Stored/displayed text of a serialized Transmission: the same document
+    without the XML declaration (what tostring(encoding="unicode") gives).
+    """
+    if xml_bytes.startswith(XML_DECLARATION):
+        xml_bytes = xml_bytes[len(XML_DECLARATION):]
+    return xml_bytes.decode("utf-8")
+
+
+def build_transmission_xml(elements, with_text=True):
+    """
+    Wraps one or more invoice GLogXMLElements in a single Transmission.
+    OTM processes each element as its own transaction, in order.
+
+    Serializes once; the text is derived from the bytes (None when
+    with_text is False).
+    """
+    root = etree.Element(f"{{{NS}}}Transmission", nsmap={"otm": NS})
+
+    # ---------- HEADER ----------
+    header = e(root, "TransmissionHeader")
+    e(header, "Version", "25c")
+
+    tcd = e(header, "TransmissionCreateDt")
+    e(tcd, "GLogDate", datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
+    e(tcd, "TZId", "UTC")
+    e(tcd, "TZOffset", "+00:00")
+
+    e(header, "GLogXMLElementName", "INVOICE")
+
+    # ---------- BODY ----------
+    body = e(root, "TransmissionBody")
+    for gx in elements:
+        body.append(gx)
+
+    xml_bytes = etree.tostring(root, pretty_print=True, encoding="UTF-8", xml_declaration=True)
+
+    return xml_bytes, xml_text(xml_bytes) if with_text else None
+
+
+def build_invoice_xml(invoice_rows, field_mapping=None):
+    return build_transmission_xml([build_invoice_element(invoice_rows, field_mapping)])
+
+
+# ============================================================
+# STREAMING WRITER (VERY LARGE INVOICES)
+# ============================================================
+class PrettyWriter:
+    """
+    etree.xmlfile writer emitting the same layout as
+    tostring(pretty_print=True): two-space indent, one element per line.
+    """
+
+    def __init__(self, xf):
+        self.xf = xf
+        self.depth = 0
+        self.started = False
+
+    def newline(self):
+        # the root start tag follows the declaration's own newline
+        if self.started:
+            self.xf.write("\n" + "  " * self.depth)
+        self.started = True
+
+    @contextmanager
+    def node(self, tag, **kwargs):
+        self.newline()
+        with self.xf.element(f"{{{NS}}}{tag}", **kwargs):
+            self.depth += 1
+            yield
+            self.depth -= 1
+            self.newline()
+
+    def leaf(self, tag, text):
+        self.newline()
+        with self.xf.element(f"{{{NS}}}{tag}"):
+            self.xf.write(clean(text))
+
+    def gid(self, tag, xid, domain=None):
+        with self.node(tag):
+            with self.node("Gid"):
+                if domain is not None:
+                    self.leaf("DomainName", domain)
+                self.leaf("Xid", xid)
+
+
+def write_invoice_xml(invoice_rows, out, field_mapping=None):
+    """
+    Writes the one-invoice Transmission of build_invoice_xml to out (a
+    path or binary file object), byte for byte, without building the
+    tree: every GenericLineItem is written and dropped as it is produced,
+    so memory does not grow with the number of lines.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "wb") as f:
+            return write_invoice_xml(invoice_rows, f, field_mapping)
+
+    head, rows, total_amount = invoice_plan(invoice_rows, field_mapping)
+
+    domain = head["domainName"]
+    currency = head["currencyGid"]
+
+    with etree.xmlfile(out, encoding="UTF-8") as xf:
+        xf.write_declaration()
+        w = PrettyWriter(xf)
+
+        with w.node("Transmission", nsmap={"otm": NS}):
+
+            # ---------- HEADER ----------
+            with w.node("TransmissionHeader"):
+                w.leaf("Version", "25c")
+                with w.node("TransmissionCreateDt"):
+                    w.leaf("GLogDate", datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
+                    w.leaf("TZId", "UTC")
+                    w.leaf("TZOffset", "+00:00")
+                w.leaf("GLogXMLElementName", "INVOICE")
+
+            # ---------- BODY ----------
+            with w.node("TransmissionBody"), w.node("GLogXMLElement"), \
+                    w.node("Invoice"), w.node("Payment"):
+
+                # ---------- PAYMENT HEADER ----------
+                with w.node("PaymentHeader"):
+                    w.leaf("DomainName", domain)
+                    w.gid("InvoiceGid", head["invoiceXid"], domain)
+                    w.leaf("TransactionCode", "IU")
+                    w.leaf("InvoiceNum", head["invoiceNumber"])
+
+                    with w.node("InvoiceDate"):
+                        w.leaf("GLogDate", head["invoiceDate"])
+                        w.leaf("TZId", "UTC")
+                        w.leaf("TZOffset", "+00:00")
+
+                    with w.node("InvoiceRefnum"):
+                        w.gid("InvoiceRefnumQualifierGid", "BM")
+                        w.leaf("InvoiceRefnumValue", head["invoiceNumber"])
+
+                    w.gid("ServiceProviderGid", head["serviceProvider"], domain)
+
+                    with w.node("ServiceProviderAlias"):
+                        w.gid("ServiceProviderAliasQualifierGid", "GLOG")
+                        w.leaf("ServiceProviderAliasValue", f"{domain}.{head['serviceProvider']}")
+
+                    w.leaf("GlobalCurrencyCode", currency)
+
+                # ---------- LINE ITEMS ----------
+                with w.node("PaymentModeDetail"), w.node("GenericDetail"):
+                    for line_no, (shipment_gid, cost_type, line_currency, amount) in enumerate(rows, start=1):
+                        with w.node("GenericLineItem"):
+                            w.leaf("AssignedNum", str(line_no))
+
+                            with w.node("LineItemRefNum"):
+                                w.leaf("LineItemRefNumValue", shipment_gid)
+                                w.gid("LineItemRefNumQualifierGid", "GLOG")
+
+                            with w.node("CommonInvoiceLineElements"):
+                                with w.node("Commodity"):
+                                    w.leaf("Description", cost_type)
+                                with w.node("FreightRate"), w.node("FreightCharge"), \
+                                        w.node("FinancialAmount"):
+                                    w.leaf("GlobalCurrencyCode", line_currency)
+                                    w.leaf("MonetaryAmount", amount)
+                                    w.leaf("RateToBase", "1.0")
+                                    w.leaf("FuncCurrencyAmount", "0.0")
+
+                            w.gid("CostTypeGid", cost_type)
+
+                # ---------- SUMMARY ----------
+                with w.node("PaymentSummary"):
+                    with w.node("FreightCharge"), w.node("FinancialAmount"):
+                        w.leaf("GlobalCurrencyCode", currency)
+                        w.leaf("MonetaryAmount", f"{total_amount:.4f}")
+                    w.leaf("InvoiceTotal", "1")
+
+    # pretty_print ends the document with a newline
+    out.write(b"\n")
+
+
+def stream_invoice_xml(invoice_rows, field_mapping=None):
+    """write_invoice_xml into memory; returns the bytes only (see xml_text)"""
+    out = io.BytesIO()
+    write_invoice_xml(invoice_rows, out, field_mapping)
+    return out.getvalue()
+
+
+def pack_transmissions(items, max_invoices, max_bytes=None, size=len):
+    """
+    Groups items into lists that fit one Transmission: at most max_invoices
+    items and, when max_bytes is set, at most max_bytes of size(item).
+    An item larger than max_bytes still goes out, alone.
+    """
+    batch = []
+    batch_bytes = 0
+
+    for item in items:
+        item_bytes = size(item)
+
+        if batch and (
+            len(batch) >= max_invoices
+            or (max_bytes and batch_bytes + item_bytes > max_bytes)
+        ):
+            yield batch
+            batch = []
+            batch_bytes = 0
+
+        batch.append(item)
+        batch_bytes += item_bytes
+
+    if batch:
+        yield batch
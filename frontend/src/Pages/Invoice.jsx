@@ -16,6 +16,8 @@ import { X, Upload, FolderOpen, Check, Loader2 } from "lucide-react";
 export default function Invoice() {
   const [data, setData] = useState([]);
   const [all, setAll] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(false);
   const [search, setSearch] = useState("");
   const [toast, setToast] = useState(null);
@@ -31,16 +33,34 @@ export default function Invoice() {
   const [fetchingTemplates, setFetchingTemplates] = useState(false);
 
   const API = "http://localhost:5000/api";
+  const PAGE_SIZE = 200;
   const navigate = useNavigate();
   const fileInputRef = useRef(null);
 
   // ==========================
   // LOAD DATA
   // ==========================
-  const load = async () => {
-    const res = await axios.get(`${API}/invoices`);
-    setData(res.data);
-    setAll(res.data);
+  // newest first, PAGE_SIZE rows per request; the X-Next-Cursor header
+  // (absent on the last page) is the cursor for the following page
+  const load = async (cursor = null) => {
+    const res = await axios.get(`${API}/invoices`, {
+      params: cursor ? { limit: PAGE_SIZE, cursor } : { limit: PAGE_SIZE }
+    });
+
+    const rows = cursor ? [...all, ...res.data] : res.data;
+    setAll(rows);
+    setData(applySearch(rows, search));
+    setNextCursor(res.headers["x-next-cursor"] || null);
+  };
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      await load(nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
   const fetchTemplates = async () => {
@@ -157,29 +177,29 @@ export default function Invoice() {
   // ==========================
   // SEARCH
   // ==========================
-  const filter = (v) => {
+  // search runs over the pages loaded so far
+  const applySearch = (rows, v) => {
     const value = v.toLowerCase().trim();
-    setSearch(v);
 
     // if search box is empty → show all
-    if (!value) {
-      setData(all);
-      return;
-    }
+    if (!value) return rows;
+
+    return rows.filter((i) => {
+      const invoiceXid = (i.invoice_xid || "").toLowerCase();
+      const invoiceNum = (i.invoice_num || "").toLowerCase(); // ✅ INVOICE NUMBER
+      const transmission = String(i.transmission_no || "");
+
+      return (
+        invoiceXid.includes(value) ||     // INV_116000_001_Z1
+        invoiceNum.includes(value) ||     // T1_ARFW_000003
+        transmission.includes(value)      // 903004
+      );
+    });
+  };
 
-    setData(
-      all.filter((i) => {
-        const invoiceXid = (i.invoice_xid || "").toLowerCase();
-        const invoiceNum = (i.invoice_num || "").toLowerCase(); // ✅ INVOICE NUMBER
-        const transmission = String(i.transmission_no || "");
-
-        return (
-          invoiceXid.includes(value) ||     // INV_116000_001_Z1
-          invoiceNum.includes(value) ||     // T1_ARFW_000003
-          transmission.includes(value)      // 903004
-        );
-      })
-    );
+  const filter = (v) => {
+    setSearch(v);
+    setData(applySearch(all, v));
   };
 
 
@@ -447,6 +467,18 @@ export default function Invoice() {
         </tbody>
       </table>
 
+      {nextCursor && (
+        <div className="flex justify-center mt-4">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className={`flex items-center gap-2 bg-slate-700 text-white px-4 py-2 rounded-lg hover:bg-slate-800 transition-colors shadow-sm font-medium text-sm ${loadingMore ? 'opacity-50 cursor-not-allowed' : ''}`}
+          >
+            {loadingMore && <Loader2 className="w-4 h-4 animate-spin" />}
+            Load more
+          </button>
+        </div>
+      )}
 
     </div>
   );
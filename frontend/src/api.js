@@ -23,8 +23,10 @@ export const uploadExcel = (file) => {
    FETCH XML INVOICES
 ====================================================== */
 
-export const getInvoices = () => {
-  return api.get("/invoices");
+// one page, newest first; pass the X-Next-Cursor header of a response
+// as cursor to get the next one
+export const getInvoices = (cursor = null, limit = 200) => {
+  return api.get("/invoices", { params: cursor ? { limit, cursor } : { limit } });
 };
 
 /* ======================================================